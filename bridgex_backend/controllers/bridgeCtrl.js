@@ -128,10 +128,16 @@ const calculateDesignMetrics = (bridgeData, analysisResult) => {
     // Métricas de estabilidad
     metrics.stability = {
       safety_margin: analysisResult.safetyFactor > 1 ? (analysisResult.safetyFactor - 1) * 100 : 0,
-      redundancy_level: calculateRedundancy(bridgeData.beams, bridgeData.nodes),
+      redundancy_level: analysisResult.redundancy_analysis?.redundancy_index ??
+                        calculateRedundancy(bridgeData.beams, bridgeData.nodes),
       support_adequacy: (bridgeData.supports?.length || 0) / nodeCount
     };
     
+    // Miembros cuya pérdida causa inestabilidad o sobreesfuerzo (análisis N-1)
+    if (analysisResult.redundancy_analysis?.critical_members) {
+      metrics.stability.critical_members = analysisResult.redundancy_analysis.critical_members;
+    }
+    
   } catch (error) {
     console.error('Error calculando métricas:', error);
     metrics.error = error.message;
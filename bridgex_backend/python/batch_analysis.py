@@ -0,0 +1,323 @@
+# batch_analysis.py
+# Análisis por lotes de diseños almacenados (JSONL o directorio) con checkpoints reanudables
+
+import os
+import sys
+import json
+import logging
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from bridge_service import run_analysis
+
+# Filas acumuladas antes de escribir un bloque de salida
+DEFAULT_FLUSH_EVERY = 200
+
+# Diseños en vuelo por proceso (limita la memoria del pipeline)
+IN_FLIGHT_PER_WORKER = 4
+
+def iter_design_sources(input_path):
+    """Generar (clave, texto JSON) desde un archivo JSONL o un directorio de exports"""
+    if os.path.isdir(input_path):
+        for root, dirs, files in os.walk(input_path):
+            dirs.sort()
+            for name in sorted(files):
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                with open(path, encoding='utf-8') as f:
+                    yield os.path.relpath(path, input_path), f.read()
+    else:
+        with open(input_path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    yield f"{os.path.basename(input_path)}:{line_number}", line
+
+def normalize_design(design):
+    """Convertir un export del frontend (puente_design.json) al formato de análisis"""
+    nodes = design.get('nodes', [])
+    if not nodes or not isinstance(nodes[0], dict):
+        return design
+
+    # Las vigas exportadas referencian ids de nodo, no índices
+    index_by_id = {node.get('id', idx): idx for idx, node in enumerate(nodes)}
+
+    beams = []
+    for beam in design.get('beams', []):
+        if isinstance(beam, dict):
+            beams.append([index_by_id.get(beam.get('start'), -1), index_by_id.get(beam.get('end'), -1)])
+        else:
+            beams.append(beam)
+
+    return {
+        'nodes': [[node.get('x', 0), node.get('y', 0)] for node in nodes],
+        'beams': beams,
+        'supports': [idx for idx, node in enumerate(nodes) if node.get('isSupport')],
+        'loads': [
+            {'node': idx, 'fx': (node.get('load') or {}).get('fx', 0), 'fy': (node.get('load') or {}).get('fy', 0)}
+            for idx, node in enumerate(nodes)
+            if (node.get('load') or {}).get('fx') or (node.get('load') or {}).get('fy')
+        ],
+        'analysis_options': design.get('analysis_options', {})
+    }
+
+def init_worker(log_level):
+    """Inicializar el proceso de trabajo con un nivel de log reducido"""
+    logging.getLogger().setLevel(log_level)
+
+def analyze_design(key, raw_design, use_matlab):
+    """Analizar un diseño y devolver una fila de resultado (nunca lanza excepciones)"""
+    start_time = datetime.now()
+
+    try:
+        data = normalize_design(json.loads(raw_design))
+        # El historial de motores se lee pero no se reescribe por cada diseño
+        result = run_analysis(data, use_matlab=use_matlab, persist_history=False)
+        error = result.get('error') if result else 'empty_result'
+    except Exception as e:
+        result, error = None, str(e)
+
+    result = result or {}
+    return {
+        'design_key': key,
+        'status': result.get('status', 'error'),
+        'backend': result.get('backend'),
+        'max_stress': result.get('maxStress'),
+        'safety_factor': result.get('safetyFactor'),
+        'nodes_count': result.get('analysis_info', {}).get('nodes_count'),
+        'beams_count': result.get('analysis_info', {}).get('beams_count'),
+        'error': error,
+        'processing_time': (datetime.now() - start_time).total_seconds(),
+        'result_json': json.dumps(result, ensure_ascii=False) if result else None
+    }
+
+def truncate_partial_line(path):
+    """Descartar una última línea incompleta (escritura interrumpida) antes de reanudar en modo append"""
+    if not os.path.exists(path):
+        return
+
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        position = size
+        while position > 0:
+            block = min(65536, position)
+            f.seek(position - block)
+            newline = f.read(block).rfind(b'\n')
+            if newline >= 0:
+                position = position - block + newline + 1
+                break
+            position -= block
+
+        if position < size:
+            logging.warning(f"✂️ Descartando línea incompleta al final de {path} ({size - position} bytes)")
+            f.truncate(position)
+            os.fsync(f.fileno())
+
+class JsonlResultWriter:
+    """Escritor incremental de resultados en JSONL (modo append para reanudar)"""
+
+    def __init__(self, output_path):
+        # Una fila a medio escribir se uniría con la siguiente y corrompería ambas
+        truncate_partial_line(output_path)
+        self.file = open(output_path, 'a', encoding='utf-8')
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+class ParquetResultWriter:
+    """Escritor incremental de resultados en Parquet: un archivo part-NNNNN por bloque"""
+
+    def __init__(self, output_path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as import_error:
+            raise ImportError("pyarrow no disponible - instalar pyarrow para salida Parquet") from import_error
+
+        self.pa = pa
+        self.pq = pq
+        self.output_path = output_path
+        self.schema = pa.schema([
+            ('design_key', pa.string()),
+            ('status', pa.string()),
+            ('backend', pa.string()),
+            ('max_stress', pa.float64()),
+            ('safety_factor', pa.float64()),
+            ('nodes_count', pa.int64()),
+            ('beams_count', pa.int64()),
+            ('error', pa.string()),
+            ('processing_time', pa.float64()),
+            ('result_json', pa.string())
+        ])
+
+        os.makedirs(output_path, exist_ok=True)
+
+        # Temporales de una ejecución interrumpida: sus filas no llegaron al checkpoint
+        for name in os.listdir(output_path):
+            if name.startswith('.part-') and name.endswith('.tmp'):
+                os.remove(os.path.join(output_path, name))
+
+        parts = [name for name in os.listdir(output_path) if name.startswith('part-') and name.endswith('.parquet')]
+        self.next_part = max((int(name[5:-8]) for name in parts if name[5:-8].isdigit()), default=-1) + 1
+
+    def write_rows(self, rows):
+        # ParquetWriter no admite append y el footer solo se escribe al cerrar:
+        # cada bloque es un archivo completo que aparece de forma atómica
+        name = f"part-{self.next_part:05d}.parquet"
+        tmp_path = os.path.join(self.output_path, f".{name}.tmp")
+
+        with open(tmp_path, 'wb') as f:
+            self.pq.write_table(self.pa.Table.from_pylist(rows, schema=self.schema), f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, os.path.join(self.output_path, name))
+        self.next_part += 1
+
+    def close(self):
+        pass
+
+class Checkpoint:
+    """Registro append-only de diseños procesados para reanudar ejecuciones interrumpidas"""
+
+    def __init__(self, path):
+        # Cada línea es `clave<TAB>estado` ('ok' o 'failed'); la última línea de una clave prevalece
+        self.path = path
+        self.completed = set()
+        self.failed = set()
+
+        truncate_partial_line(path)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    key, _, status = line.rstrip('\n').partition('\t')
+                    if key:
+                        self.record(key, status == 'failed')
+
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def record(self, key, failed):
+        self.completed.add(key)
+        if failed:
+            self.failed.add(key)
+        else:
+            self.failed.discard(key)
+
+    def mark_completed(self, rows):
+        # Se registra después de escribir los resultados (semántica al-menos-una-vez)
+        if not rows:
+            return
+        for row in rows:
+            failed = bool(row['error'])
+            self.file.write(f"{row['design_key']}\t{'failed' if failed else 'ok'}\n")
+            self.record(row['design_key'], failed)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+def run_batch(input_path, output_path, output_format='jsonl', checkpoint_path=None, workers=None,
+              use_matlab=False, flush_every=DEFAULT_FLUSH_EVERY, log_level=logging.WARNING, retry_failed=False):
+    """Procesar un corpus de diseños en un pool de procesos con memoria acotada"""
+    writer = ParquetResultWriter(output_path) if output_format == 'parquet' else JsonlResultWriter(output_path)
+    checkpoint = Checkpoint(checkpoint_path or f"{output_path}.checkpoint")
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * IN_FLIGHT_PER_WORKER
+    stats = {'processed': 0, 'skipped': 0, 'failed': 0}
+    pending_rows = []
+
+    logging.info(f"📦 Lote: {input_path} -> {output_path} ({output_format}), {workers} procesos")
+    if checkpoint.completed:
+        logging.info(f"♻️ Reanudando: {len(checkpoint.completed)} diseños ya procesados, {len(checkpoint.failed)} con error"
+                     + (" (se reintentan)" if retry_failed else ""))
+
+    def flush():
+        if pending_rows:
+            writer.write_rows(pending_rows)
+            checkpoint.mark_completed(pending_rows)
+            pending_rows.clear()
+
+    def collect(done):
+        for future in done:
+            row = future.result()
+            stats['processed'] += 1
+            if row['error']:
+                stats['failed'] += 1
+            pending_rows.append(row)
+        if len(pending_rows) >= flush_every:
+            flush()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(log_level,)) as executor:
+            in_flight = set()
+
+            for key, raw_design in iter_design_sources(input_path):
+                # Todo diseño registrado se omite; con retry_failed los fallidos se reanalizan y su
+                # nueva fila se agrega a la salida (la fila más reciente de cada diseño prevalece)
+                if key in checkpoint.completed and not (retry_failed and key in checkpoint.failed):
+                    stats['skipped'] += 1
+                    continue
+
+                # Mantener acotado el número de diseños en memoria
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+                in_flight.add(executor.submit(analyze_design, key, raw_design, use_matlab))
+
+            done, _ = wait(in_flight)
+            collect(done)
+
+        flush()
+    finally:
+        writer.close()
+        checkpoint.close()
+
+    logging.info(f"🏁 Lote completado: {stats['processed']} procesados, {stats['failed']} con error, {stats['skipped']} omitidos")
+    return stats
+
+def batch_main(argv):
+    """Punto de entrada del subcomando `batch`"""
+    parser = argparse.ArgumentParser(
+        prog='bridge_service.py batch',
+        description='Analizar un corpus de diseños (JSONL o directorio de exports) con checkpoints reanudables'
+    )
+    parser.add_argument('input', help='Archivo JSONL (un diseño por línea) o directorio con archivos .json')
+    parser.add_argument('--output', '-o', required=True, help='Archivo JSONL o directorio Parquet de salida')
+    parser.add_argument('--format', choices=['jsonl', 'parquet'], default=None,
+                        help='Formato de salida (por defecto según la extensión de --output)')
+    parser.add_argument('--checkpoint', default=None, help='Archivo de checkpoint (por defecto <output>.checkpoint)')
+    parser.add_argument('--workers', type=int, default=None, help='Número de procesos (por defecto: núcleos)')
+    parser.add_argument('--matlab', action='store_true', help='Intentar MATLAB Engine antes del análisis Python')
+    parser.add_argument('--flush-every', type=int, default=DEFAULT_FLUSH_EVERY,
+                        help='Filas acumuladas antes de escribir y registrar el checkpoint')
+    parser.add_argument('--retry-failed', action='store_true',
+                        help='Reanalizar los diseños cuyo último resultado registrado fue un error')
+    parser.add_argument('--log-level', default='WARNING', help='Nivel de log de los procesos de trabajo')
+    args = parser.parse_args(argv)
+
+    output_format = args.format or ('parquet' if args.output.endswith('.parquet') else 'jsonl')
+
+    stats = run_batch(
+        args.input,
+        args.output,
+        output_format=output_format,
+        checkpoint_path=args.checkpoint,
+        workers=args.workers,
+        use_matlab=args.matlab,
+        flush_every=args.flush_every,
+        log_level=args.log_level.upper(),
+        retry_failed=args.retry_failed
+    )
+
+    sys.stdout.write(json.dumps(stats) + '\n')
+    return 0 if stats['failed'] == 0 else 1
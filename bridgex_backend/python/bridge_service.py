@@ -2,14 +2,32 @@
 # bridge_service.py
 # Análisis estructural avanzado de puentes con fallback inteligente
 
+import os
 import sys
 import json
 import traceback
 import logging
 import numpy as np
 import math
+import time
 from datetime import datetime
 
+from engine_scheduler import (
+    AnalysisCancelled,
+    load_engine_history,
+    update_engine_history,
+    plan_engines,
+    record_run,
+    run_sequential,
+    run_hedged
+)
+from preprocessing import (
+    DEFAULT_MERGE_TOLERANCE,
+    preprocess_bridge_data,
+    map_beam_index_to_processed,
+    map_result_to_original
+)
+
 # Configurar logging mejorado
 logging.basicConfig(
     level=logging.DEBUG,
@@ -460,7 +478,20 @@ def generate_error_result(error_type, message):
         'timestamp': datetime.now().isoformat()
     }
 
-def matlab_analysis(data):
+def wait_matlab_future(future, cancel_event=None, timeout=None):
+    """Esperar un FutureResult de MATLAB permitiendo cancelación cooperativa"""
+    start = time.monotonic()
+    while not future.done():
+        if cancel_event is not None and cancel_event.is_set():
+            future.cancel()
+            raise AnalysisCancelled("MATLAB cancelado: otro motor terminó primero")
+        if timeout is not None and time.monotonic() - start > timeout:
+            future.cancel()
+            raise TimeoutError(f"MATLAB excedió el timeout de {timeout}s")
+        time.sleep(0.05)
+    return future.result()
+
+def matlab_analysis(data, cancel_event=None):
     """Análisis usando MATLAB Engine con manejo mejorado de errores"""
     logging.info("🔬 Intentando análisis con MATLAB Engine")
     
@@ -469,7 +500,11 @@ def matlab_analysis(data):
         logging.info("✅ MATLAB engine importado exitosamente")
         
         # Configuración de inicio más robusta
-        eng = matlab.engine.start_matlab('-nodisplay', '-nosplash', '-nodesktop')
+        # (en segundo plano para poder cancelarlo si otro motor gana la carrera)
+        eng = wait_matlab_future(
+            matlab.engine.start_matlab('-nodisplay -nosplash -nodesktop', background=True),
+            cancel_event
+        )
         logging.info("✅ MATLAB engine iniciado con configuración optimizada")
         
         # Configurar path de MATLAB
@@ -489,7 +524,11 @@ def matlab_analysis(data):
         
         try:
             # Ejecutar análisis con timeout
-            result_str = eng.analyzeBridge(json_str, nargout=1, timeout=30)
+            result_str = wait_matlab_future(
+                eng.analyzeBridge(json_str, nargout=1, background=True),
+                cancel_event,
+                timeout=30
+            )
             logging.info("✅ MATLAB análisis completado")
             
             # Procesar resultado
@@ -524,6 +563,148 @@ def matlab_analysis(data):
         logging.error(f"❌ Error general en MATLAB: {str(e)}")
         raise e
 
+def run_analysis(data, use_matlab=True, persist_history=True):
+    """Ejecutar la estrategia de análisis planificada y devolver el resultado enriquecido.
+
+    persist_history=False usa el historial de motores solo para planificar, sin reescribirlo
+    (el modo batch lo desactiva para no reescribir el archivo en cada diseño)
+    """
+    # ESTRATEGIA DE ANÁLISIS: orden de motores elegido por el planificador
+    final_result = None
+    analysis_attempts = []
+    analysis_options = data.get('analysis_options', {}) or {}
+
+    # 0. PREPROCESAMIENTO: fusionar nodos coincidentes y eliminar vigas duplicadas
+    preprocessing_report = None
+    if analysis_options.get('preprocess', True):
+        try:
+            data, preprocessing_report = preprocess_bridge_data(
+                data,
+                tolerance=analysis_options.get('merge_tolerance', DEFAULT_MERGE_TOLERANCE)
+            )
+        except Exception as preprocess_error:
+            logging.warning(f"⚠️ Preprocesamiento falló, se analizan los datos originales: {preprocess_error}")
+            traceback.print_exc(file=sys.stderr)
+
+    runners = {
+        'matlab_engine': matlab_analysis,
+        'advanced_python': lambda engine_data, cancel_event: advanced_dummy_analysis(engine_data)
+    }
+    engines = [e for e in runners if use_matlab or e != 'matlab_engine']
+
+    history = load_engine_history()
+    decision = plan_engines(data, history, engines, analysis_options)
+    analysis_attempts.append(decision)
+
+    # 1. MODO CUBIERTO: competir entre los motores con la precisión requerida y cancelar el perdedor
+    if decision['hedged']:
+        eligible = [e for e in decision['order'] if e not in decision['fallback']]
+        final_result, hedged_attempts = run_hedged(data, runners, eligible, decision['hedge_delay'])
+        analysis_attempts.extend(hedged_attempts)
+
+    # 2. MODO SECUENCIAL: probar en orden los motores que no se intentaron (respaldo si la cobertura falló)
+    if final_result is None:
+        attempted = {a['method'] for a in analysis_attempts}
+        remaining = [e for e in decision['order'] if e not in attempted]
+        final_result, sequential_attempts = run_sequential(data, runners, remaining)
+        analysis_attempts.extend(sequential_attempts)
+
+    # Los resultados se aplican sobre la versión actual del archivo (otros procesos pueden haberlo escrito)
+    if persist_history:
+        update_engine_history(lambda latest: record_run(latest, decision, analysis_attempts))
+
+    # 3. ÚLTIMO RECURSO: Análisis básico garantizado
+    if final_result is None:
+        logging.error("❌ Todos los métodos avanzados fallaron, usando análisis básico")
+        
+        try:
+            final_result = basic_fallback_analysis(data)
+            analysis_attempts.append({
+                'method': 'basic_fallback',
+                'status': 'success',
+                'processing_time': 0.1
+            })
+        except Exception as basic_error:
+            logging.critical(f"💥 Incluso el análisis básico falló: {basic_error}")
+            final_result = {
+                'status': 'critical_error',
+                'error': 'All analysis methods failed',
+                'details': str(basic_error),
+                'backend': 'emergency_fallback',
+                'timestamp': datetime.now().isoformat()
+            }
+
+    # 4. ANÁLISIS OPCIONAL DE RUTAS ALTERNATIVAS DE CARGA (N-1)
+    if final_result and 'error' not in final_result and analysis_options.get('redundancy'):
+        try:
+            logging.info("🎯 [OPCIONAL] Análisis de redundancia N-1...")
+            start_time = datetime.now()
+
+            from redundancy_analysis import run_redundancy_analysis
+
+            # El miembro inicial llega en la numeración original de vigas
+            requested_member = analysis_options.get('initial_member')
+            initial_member = requested_member
+            collapse_error = None
+            if preprocessing_report is not None and requested_member is not None and analysis_options.get('progressive_collapse'):
+                try:
+                    initial_member = map_beam_index_to_processed(requested_member, preprocessing_report['beam_map'])
+                except ValueError as mapping_error:
+                    collapse_error = str(mapping_error)
+
+            redundancy = run_redundancy_analysis(
+                data,
+                progressive_collapse=analysis_options.get('progressive_collapse', False) and collapse_error is None,
+                initial_member=initial_member,
+                max_workers=analysis_options.get('max_workers')
+            )
+
+            if collapse_error:
+                logging.warning(f"⚠️ Colapso progresivo omitido: {collapse_error}")
+                redundancy['progressive_collapse'] = {'error': collapse_error}
+            if 'error' in redundancy.get('progressive_collapse', {}):
+                redundancy['progressive_collapse']['initial_member'] = requested_member
+
+            final_result['redundancy_analysis'] = redundancy
+
+            processing_time = (datetime.now() - start_time).total_seconds()
+            analysis_attempts.append({
+                'method': 'redundancy_n_minus_1',
+                'status': 'success',
+                'processing_time': processing_time
+            })
+
+        except Exception as redundancy_error:
+            processing_time = (datetime.now() - start_time).total_seconds()
+            logging.error(f"❌ Análisis de redundancia falló: {redundancy_error}")
+
+            analysis_attempts.append({
+                'method': 'redundancy_n_minus_1',
+                'status': 'failed',
+                'error': str(redundancy_error),
+                'processing_time': processing_time
+            })
+
+            traceback.print_exc(file=sys.stderr)
+
+    # ENRIQUECER RESULTADO FINAL
+    if final_result and 'error' not in final_result:
+        # Todos los campos por viga en la numeración original (la que conoce el frontend)
+        if preprocessing_report is not None:
+            final_result = map_result_to_original(
+                final_result, preprocessing_report, len(data.get('nodes', [])), len(data.get('beams', []))
+            )
+
+        final_result['analysis_attempts'] = analysis_attempts
+        final_result['service_metadata'] = {
+            'service_version': '2.0',
+            'total_methods_tried': len(analysis_attempts),
+            'successful_method': next((a['method'] for a in analysis_attempts if a['status'] == 'success'), 'none'),
+            'total_processing_time': sum(a.get('processing_time', 0) for a in analysis_attempts)
+        }
+
+    return final_result
+
 def main():
     logging.info("🚀 [INICIANDO] BridgeX Advanced Structural Analysis Service v2.0")
     
@@ -571,104 +752,7 @@ def main():
         print(json.dumps(error_result))
         sys.exit(1)
 
-    # ESTRATEGIA DE ANÁLISIS JERARQUIZADA
-    final_result = None
-    analysis_attempts = []
-
-    # 1. INTENTO PRIMARIO: MATLAB Engine (más preciso)
-    try:
-        logging.info("🎯 [INTENTO 1/2] Análisis con MATLAB Engine...")
-        start_time = datetime.now()
-        
-        matlab_result = matlab_analysis(data)
-        
-        processing_time = (datetime.now() - start_time).total_seconds()
-        logging.info(f"✅ MATLAB exitoso en {processing_time:.2f}s")
-        
-        analysis_attempts.append({
-            'method': 'matlab_engine',
-            'status': 'success',
-            'processing_time': processing_time
-        })
-        
-        final_result = matlab_result
-        
-    except Exception as matlab_error:
-        processing_time = (datetime.now() - start_time).total_seconds()
-        logging.warning(f"⚠️ MATLAB falló en {processing_time:.2f}s: {matlab_error}")
-        
-        analysis_attempts.append({
-            'method': 'matlab_engine',
-            'status': 'failed',
-            'error': str(matlab_error),
-            'processing_time': processing_time
-        })
-        
-        # Imprimir traceback completo para depuración
-        traceback.print_exc(file=sys.stderr)
-
-    # 2. INTENTO SECUNDARIO: Análisis Python Avanzado (fallback inteligente)
-    if final_result is None:
-        try:
-            logging.info("🎯 [INTENTO 2/2] Fallback a análisis Python avanzado...")
-            start_time = datetime.now()
-            
-            python_result = advanced_dummy_analysis(data)
-            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logging.info(f"✅ Python avanzado exitoso en {processing_time:.2f}s")
-            
-            analysis_attempts.append({
-                'method': 'advanced_python',
-                'status': 'success',
-                'processing_time': processing_time
-            })
-            
-            final_result = python_result
-            
-        except Exception as python_error:
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logging.error(f"❌ Python avanzado falló en {processing_time:.2f}s: {python_error}")
-            
-            analysis_attempts.append({
-                'method': 'advanced_python',
-                'status': 'failed',
-                'error': str(python_error),
-                'processing_time': processing_time
-            })
-            
-            traceback.print_exc(file=sys.stderr)
-
-    # 3. ÚLTIMO RECURSO: Análisis básico garantizado
-    if final_result is None:
-        logging.error("❌ Todos los métodos avanzados fallaron, usando análisis básico")
-        
-        try:
-            final_result = basic_fallback_analysis(data)
-            analysis_attempts.append({
-                'method': 'basic_fallback',
-                'status': 'success',
-                'processing_time': 0.1
-            })
-        except Exception as basic_error:
-            logging.critical(f"💥 Incluso el análisis básico falló: {basic_error}")
-            final_result = {
-                'status': 'critical_error',
-                'error': 'All analysis methods failed',
-                'details': str(basic_error),
-                'backend': 'emergency_fallback',
-                'timestamp': datetime.now().isoformat()
-            }
-
-    # ENRIQUECER RESULTADO FINAL
-    if final_result and 'error' not in final_result:
-        final_result['analysis_attempts'] = analysis_attempts
-        final_result['service_metadata'] = {
-            'service_version': '2.0',
-            'total_methods_tried': len(analysis_attempts),
-            'successful_method': next((a['method'] for a in analysis_attempts if a['status'] == 'success'), 'none'),
-            'total_processing_time': sum(a.get('processing_time', 0) for a in analysis_attempts)
-        }
+    final_result = run_analysis(data)
 
     # ENVIAR RESULTADO FINAL
     try:
@@ -680,6 +764,12 @@ def main():
         sys.stdout.flush()
         
         logging.info("🏁 [COMPLETADO] Análisis estructural finalizado exitosamente")
+
+        # El motor perdedor del modo cubierto puede seguir en su hilo y el intérprete lo esperaría
+        # al salir: con el resultado ya entregado, terminar sin esperarlo
+        if any(a.get('status') == 'cancelled' for a in final_result.get('analysis_attempts', [])):
+            logging.shutdown()
+            os._exit(0)
         
     except Exception as output_error:
         logging.critical(f"💥 Error enviando resultado: {output_error}")
@@ -750,6 +840,11 @@ def basic_fallback_analysis(data):
 
 if __name__ == '__main__':
     try:
+        # Subcomando `batch`: análisis por lotes de un corpus de diseños
+        if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+            from batch_analysis import batch_main
+            sys.exit(batch_main(sys.argv[2:]))
+
         main()
     except KeyboardInterrupt:
         logging.info("🛑 Análisis interrumpido por usuario")
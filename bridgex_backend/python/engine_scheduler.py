@@ -0,0 +1,297 @@
+# engine_scheduler.py
+# Selección de motor según costo esperado (historial de latencia/errores) y ejecución con cobertura (hedging)
+
+import os
+import sys
+import json
+import time
+import logging
+import traceback
+import tempfile
+import threading
+from itertools import permutations
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Orden histórico de la estrategia jerarquizada (se usa para motores sin historial)
+LEGACY_ORDER = ['matlab_engine', 'advanced_python']
+
+# Precisión relativa de cada motor
+ENGINE_ACCURACY = {
+    'matlab_engine': 2,
+    'advanced_python': 1
+}
+
+ACCURACY_LEVELS = {
+    'high': 2,
+    'standard': 1
+}
+
+# Límites superiores (nodos + vigas) de cada bucket de tamaño
+SIZE_BUCKETS = [16, 64, 256, 1024, 4096]
+
+# Peso de la muestra más reciente en los promedios exponenciales
+EWMA_ALPHA = 0.3
+
+# Decisiones sin probar un motor antes de volver a explorarlo
+EXPLORATION_INTERVAL = 20
+
+# Espera por defecto antes de lanzar el segundo motor en modo cubierto (s)
+DEFAULT_HEDGE_DELAY = 1.0
+
+def default_history_path():
+    """Ruta del historial: BRIDGEX_ENGINE_HISTORY o el directorio de estado del usuario"""
+    if os.environ.get('BRIDGEX_ENGINE_HISTORY'):
+        return os.environ['BRIDGEX_ENGINE_HISTORY']
+    state_home = (
+        os.environ.get('XDG_STATE_HOME')
+        or os.environ.get('LOCALAPPDATA')
+        or os.path.join(os.path.expanduser('~'), '.local', 'state')
+    )
+    return os.path.join(state_home, 'bridgex', 'engine_history.json')
+
+HISTORY_PATH = default_history_path()
+
+class AnalysisCancelled(Exception):
+    """El motor fue cancelado porque otro terminó primero"""
+
+def size_bucket(data):
+    """Bucket de tamaño del modelo según número de nodos + vigas"""
+    size = len(data.get('nodes', [])) + len(data.get('beams', []))
+    for limit in SIZE_BUCKETS:
+        if size <= limit:
+            return f"<={limit}"
+    return f">{SIZE_BUCKETS[-1]}"
+
+def load_engine_history(path=HISTORY_PATH):
+    """Cargar historial de motores (vacío si no existe o está corrupto)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def update_engine_history(apply, path=HISTORY_PATH):
+    """Releer, modificar y reescribir el historial bajo un lock (varios procesos pueden escribirlo)"""
+    try:
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+
+        with open(f"{path}.lock", 'a') as lock_file:
+            try:
+                import fcntl
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            except ImportError:
+                # Sin fcntl (Windows) el reemplazo sigue siendo atómico, pero sin lock
+                pass
+
+            history = load_engine_history(path)
+            apply(history)
+
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.engine_history', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(history, f)
+            os.replace(tmp_path, path)
+    except OSError as e:
+        logging.warning(f"⚠️ No se pudo guardar historial de motores: {e}")
+
+def engine_stats(history, bucket, engine):
+    """Estadísticas de un motor en un bucket (se crean vacías si no existen)"""
+    return history.setdefault(bucket, {}).setdefault(engine, {
+        'samples': 0,
+        'latency': None,
+        'failure_latency': None,
+        'error_rate': 0.0,
+        'decisions_since_run': 0
+    })
+
+def record_outcome(history, engine, bucket, elapsed, status):
+    """Actualizar promedios exponenciales de latencia y tasa de error"""
+    stats = engine_stats(history, bucket, engine)
+
+    def ewma(previous, value):
+        return value if previous is None else (1 - EWMA_ALPHA) * previous + EWMA_ALPHA * value
+
+    if status == 'cancelled':
+        # Un perdedor cancelado habría tardado al menos elapsed: cota inferior de la latencia,
+        # sin información sobre su tasa de error
+        previous = stats['latency']
+        stats['latency'] = ewma(previous, max(elapsed, previous if previous is not None else elapsed))
+    else:
+        if status == 'success':
+            stats['latency'] = ewma(stats['latency'], elapsed)
+        else:
+            stats['failure_latency'] = ewma(stats['failure_latency'], elapsed)
+        stats['error_rate'] = ewma(stats['error_rate'] if stats['samples'] else None, 0.0 if status == 'success' else 1.0)
+
+    stats['samples'] += 1
+    stats['decisions_since_run'] = 0
+
+def record_run(history, decision, attempts):
+    """Aplicar al historial una decisión del planificador y los resultados de sus intentos"""
+    bucket = decision['size_bucket']
+    order = decision['order']
+
+    # También los motores sin historial: si nunca se ejecutan, deben volver a explorarse
+    for engine in order[1:]:
+        engine_stats(history, bucket, engine)['decisions_since_run'] += 1
+
+    for attempt in attempts:
+        if attempt['method'] in order and attempt['status'] in ('success', 'failed', 'cancelled'):
+            record_outcome(history, attempt['method'], bucket, attempt['processing_time'], attempt['status'])
+
+def expected_completion_time(order, estimates):
+    """Tiempo esperado hasta obtener resultado probando los motores en orden"""
+    expected = 0.0
+    reach_probability = 1.0
+
+    for engine in order:
+        estimate = estimates[engine]
+        error_rate = estimate['error_rate']
+        expected += reach_probability * (
+            (1 - error_rate) * estimate['latency'] + error_rate * estimate['failure_latency']
+        )
+        reach_probability *= error_rate
+
+    return expected
+
+def plan_engines(data, history, engines, options=None):
+    """Elegir el orden de motores con menor tiempo esperado dentro de la precisión requerida"""
+    options = options or {}
+    bucket = size_bucket(data)
+    required_accuracy = ACCURACY_LEVELS.get(options.get('accuracy', 'standard'), 1)
+
+    estimates = {}
+    unexplored = []
+    for engine in engines:
+        stats = history.get(bucket, {}).get(engine)
+        if not stats or not stats['samples'] or stats['decisions_since_run'] >= EXPLORATION_INTERVAL:
+            unexplored.append(engine)
+            continue
+
+        latency = stats['latency'] if stats['latency'] is not None else stats['failure_latency']
+        estimates[engine] = {
+            'latency': round(latency, 4),
+            'failure_latency': round(stats['failure_latency'] if stats['failure_latency'] is not None else latency, 4),
+            'error_rate': round(stats['error_rate'], 4),
+            'samples': stats['samples']
+        }
+
+    # Motores que cumplen la precisión primero; los demás quedan como respaldo
+    eligible = [e for e in engines if ENGINE_ACCURACY.get(e, 0) >= required_accuracy] or list(engines)
+    fallback = [e for e in engines if e not in eligible]
+
+    # Sin historial suficiente: explorar en el orden histórico para obtener muestras
+    if any(e in unexplored for e in eligible):
+        order = sorted(eligible, key=lambda e: (e not in unexplored, LEGACY_ORDER.index(e)))
+        reason = 'exploration'
+    else:
+        order = list(min(permutations(eligible), key=lambda o: expected_completion_time(o, estimates)))
+        reason = 'lowest_expected_time'
+
+    fallback = sorted(fallback, key=lambda e: estimates.get(e, {}).get('latency', float('inf')))
+    order += fallback
+
+    # Solo compiten motores con la precisión requerida; los de respaldo se prueban si todos fallan
+    hedged = bool(options.get('latency_sensitive')) and len(eligible) > 1
+    decision = {
+        'method': 'engine_scheduler',
+        'status': 'decision',
+        'size_bucket': bucket,
+        'required_accuracy': options.get('accuracy', 'standard'),
+        'order': order,
+        'fallback': fallback,
+        'reason': reason,
+        'estimates': estimates,
+        'expected_time': round(expected_completion_time(order, estimates), 4) if len(estimates) == len(order) else None,
+        'hedged': hedged,
+        'hedge_delay': options.get('hedge_delay', DEFAULT_HEDGE_DELAY) if hedged else None,
+        'processing_time': 0
+    }
+
+    logging.info(f"🧭 Planificador: bucket {bucket}, orden {order} ({reason}){' con cobertura' if hedged else ''}")
+    return decision
+
+def run_sequential(data, runners, order):
+    """Probar los motores en orden hasta que uno termine con éxito"""
+    attempts = []
+
+    for attempt_number, engine in enumerate(order, start=1):
+        logging.info(f"🎯 [INTENTO {attempt_number}/{len(order)}] Análisis con {engine}...")
+        start_time = time.monotonic()
+
+        try:
+            result = runners[engine](data, None)
+        except Exception as e:
+            elapsed = time.monotonic() - start_time
+            logging.warning(f"⚠️ {engine} falló en {elapsed:.2f}s: {e}")
+            attempts.append({'method': engine, 'status': 'failed', 'error': str(e), 'processing_time': elapsed})
+            # Imprimir traceback completo para depuración
+            traceback.print_exc(file=sys.stderr)
+            continue
+
+        elapsed = time.monotonic() - start_time
+        logging.info(f"✅ {engine} exitoso en {elapsed:.2f}s")
+        attempts.append({'method': engine, 'status': 'success', 'processing_time': elapsed})
+        return result, attempts
+
+    return None, attempts
+
+def run_hedged(data, runners, order, hedge_delay):
+    """Lanzar el motor preferido y, si no termina tras hedge_delay, competir con el siguiente.
+
+    El perdedor recibe una señal de cancelación cooperativa, pero su hilo puede seguir vivo:
+    quien llame debe terminar el proceso sin esperarlo (ver bridge_service.main)
+    """
+    attempts = []
+    cancel_events = {engine: threading.Event() for engine in order[:2]}
+    start_times = {}
+    executor = ThreadPoolExecutor(max_workers=2)
+
+    def launch(engine):
+        logging.info(f"🏁 [COBERTURA] Lanzando {engine}")
+        start_times[engine] = time.monotonic()
+        future = executor.submit(runners[engine], data, cancel_events[engine])
+        futures[future] = engine
+
+    futures = {}
+    launch(order[0])
+    done, _ = wait(list(futures), timeout=hedge_delay)
+    if not done:
+        launch(order[1])
+
+    result = None
+    pending = set(futures)
+    while pending and result is None:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            engine = futures[future]
+            elapsed = time.monotonic() - start_times[engine]
+            try:
+                engine_result = future.result()
+            except Exception as e:
+                logging.warning(f"⚠️ {engine} falló en {elapsed:.2f}s: {e}")
+                attempts.append({'method': engine, 'status': 'failed', 'error': str(e), 'processing_time': elapsed})
+                # Si el preferido falla antes del hedge_delay, lanzar el otro de inmediato
+                if len(futures) < 2:
+                    launch(order[1])
+                    pending = {f for f in futures if not f.done()}
+                continue
+
+            # Ambos pueden terminar a la vez: gana el primero, el otro se registra igual
+            attempts.append({'method': engine, 'status': 'success', 'processing_time': elapsed, 'hedge_winner': result is None})
+            if result is None:
+                result = engine_result
+
+    # Cancelar el perdedor: sus resultados se descartan
+    for future in pending:
+        engine = futures[future]
+        cancel_events[engine].set()
+        future.cancel()
+        attempts.append({
+            'method': engine,
+            'status': 'cancelled',
+            'processing_time': time.monotonic() - start_times[engine]
+        })
+    executor.shutdown(wait=False)
+
+    return result, attempts
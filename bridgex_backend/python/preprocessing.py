@@ -0,0 +1,210 @@
+# preprocessing.py
+# Limpieza geométrica previa al análisis: fusión de nodos coincidentes y vigas duplicadas
+
+import math
+import logging
+import numpy as np
+
+from redundancy_analysis import node_coordinates
+
+# Distancia máxima (en unidades de las coordenadas, px del editor) para fusionar nodos
+DEFAULT_MERGE_TOLERANCE = 1.0
+
+def merge_coincident_nodes(nodes, tolerance):
+    """Asignar cada nodo al representante más cercano a distancia <= tolerance (hash de grilla)"""
+    roots = list(range(len(nodes)))
+    if tolerance <= 0:
+        return roots
+
+    # Solo los representantes entran en la grilla: un nodo se fusiona si está cerca del
+    # representante, no de otro miembro del grupo (evita encadenar nodos a lo largo de una viga).
+    # Celdas de lado = tolerancia: solo hay que revisar las 9 celdas vecinas
+    grid = {}
+    anchors = {}
+    for i, node in enumerate(nodes):
+        x, y = node_coordinates(node)
+        cx, cy = math.floor(x / tolerance), math.floor(y / tolerance)
+
+        nearest, nearest_distance = None, tolerance
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in grid.get((cx + dx, cy + dy), ()):
+                    distance = math.hypot(x - anchors[j][0], y - anchors[j][1])
+                    # A igual distancia gana el representante de menor índice
+                    if distance < nearest_distance or (distance == nearest_distance and (nearest is None or j < nearest)):
+                        nearest, nearest_distance = j, distance
+
+        if nearest is None:
+            # El nodo de menor índice de cada grupo es su representante
+            anchors[i] = (x, y)
+            grid.setdefault((cx, cy), []).append(i)
+        else:
+            roots[i] = nearest
+
+    return roots
+
+def preprocess_bridge_data(data, tolerance=DEFAULT_MERGE_TOLERANCE):
+    """Fusionar nodos coincidentes, eliminar vigas duplicadas o de longitud cero y remapear soportes/cargas"""
+    nodes = data.get('nodes', [])
+    beams = data.get('beams', [])
+    num_nodes = len(nodes)
+
+    # 1. NODOS: agrupar y renumerar de forma compacta conservando el orden original
+    roots = merge_coincident_nodes(nodes, tolerance)
+    representatives = sorted(set(roots))
+    new_index = {root: idx for idx, root in enumerate(representatives)}
+    node_map = [new_index[root] for root in roots]
+
+    # 2. VIGAS: remapear extremos y construir claves de arista ordenadas (min, max)
+    beam_map = [None] * len(beams)
+    zero_length = []
+    invalid = []
+    candidates = []
+    keys = []
+
+    for i, beam in enumerate(beams):
+        start, end = int(beam[0]), int(beam[1])
+        if not (0 <= start < num_nodes and 0 <= end < num_nodes):
+            invalid.append(i)
+            continue
+
+        a, b = node_map[start], node_map[end]
+        if a == b:
+            zero_length.append(i)
+            continue
+
+        candidates.append(i)
+        keys.append(min(a, b) * len(representatives) + max(a, b))
+
+    # np.unique ordena las claves: O(M log M); return_index conserva la primera aparición
+    new_beams = []
+    if candidates:
+        keys = np.asarray(keys, dtype=np.int64)
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        kept_order = np.sort(first)
+        kept_position = {int(k): idx for idx, k in enumerate(kept_order)}
+
+        for idx in kept_order:
+            start, end = beams[candidates[idx]][0], beams[candidates[idx]][1]
+            new_beams.append([node_map[int(start)], node_map[int(end)]])
+
+        # Las vigas duplicadas apuntan a la viga conservada
+        for idx, unique_idx in enumerate(np.ravel(inverse)):
+            beam_map[candidates[idx]] = kept_position[int(first[unique_idx])]
+
+    duplicates = len(candidates) - len(new_beams)
+
+    # 3. SOPORTES Y CARGAS
+    supports = sorted({node_map[int(s)] for s in data.get('supports', []) if 0 <= int(s) < num_nodes})
+
+    loads = []
+    for load in data.get('loads', []):
+        if isinstance(load, dict):
+            node = load.get('node')
+            if node is not None and 0 <= int(node) < num_nodes:
+                loads.append({**load, 'node': node_map[int(node)]})
+        elif load and 0 <= int(load[0]) < num_nodes:
+            loads.append([node_map[int(load[0])], *load[1:]])
+
+    merged_nodes = num_nodes - len(representatives)
+    if merged_nodes or duplicates or zero_length:
+        logging.info(f"🧹 Preprocesamiento: {merged_nodes} nodos fusionados, {duplicates} vigas duplicadas, {len(zero_length)} vigas de longitud cero")
+
+    processed = {
+        **data,
+        'nodes': [nodes[root] for root in representatives],
+        'beams': new_beams,
+        'supports': supports,
+        'loads': loads
+    }
+
+    report = {
+        'tolerance': tolerance,
+        'original_nodes': num_nodes,
+        'original_beams': len(beams),
+        'merged_nodes': merged_nodes,
+        'duplicate_beams': duplicates,
+        'zero_length_beams': zero_length,
+        'invalid_beams': invalid,
+        'node_map': node_map,
+        'beam_map': beam_map
+    }
+
+    return processed, report
+
+def map_beam_values_to_original(values, beam_map, default=0):
+    """Expandir valores por viga (p. ej. esfuerzos) a la numeración original"""
+    return [values[idx] if idx is not None and idx < len(values) else default for idx in beam_map]
+
+def invert_beam_map(beam_map, num_processed):
+    """Vigas originales (ordenadas) que representa cada viga preprocesada"""
+    originals = [[] for _ in range(num_processed)]
+    for original, processed in enumerate(beam_map):
+        if processed is not None and processed < num_processed:
+            originals[processed].append(original)
+    return originals
+
+def map_beam_index_to_processed(index, beam_map):
+    """Traducir un índice de viga de la numeración original a la preprocesada"""
+    if isinstance(index, bool) or not isinstance(index, int):
+        # Tipos inválidos se rechazan con el mensaje de la validación del análisis
+        return index
+    if not 0 <= index < len(beam_map):
+        raise ValueError(f"Miembro inicial {index} fuera de rango [0, {len(beam_map)})")
+    if beam_map[index] is None:
+        raise ValueError(f"Miembro inicial {index} fue eliminado en el preprocesamiento (longitud cero o nodos inválidos)")
+    return beam_map[index]
+
+def map_result_to_original(result, report, num_processed_nodes, num_processed_beams):
+    """Expresar todos los campos indexados por viga en la numeración original.
+
+    Una viga preprocesada puede representar varias originales (duplicadas): los campos escalares
+    usan la de menor índice y las listas incluyen todas.
+    """
+    originals = invert_beam_map(report['beam_map'], num_processed_beams)
+
+    def first(idx):
+        return originals[idx][0] if idx is not None and idx < len(originals) and originals[idx] else None
+
+    def expand(indices):
+        # Conserva el orden de la lista (p. ej. la secuencia de colapso)
+        return [original for idx in indices if idx < len(originals) for original in originals[idx]]
+
+    result['stresses'] = map_beam_values_to_original(result.get('stresses', []), report['beam_map'])
+
+    # Conteos del diseño recibido; los del modelo analizado quedan explícitos aparte
+    info = result.get('analysis_info')
+    if isinstance(info, dict):
+        info['nodes_count'] = report['original_nodes']
+        info['beams_count'] = report['original_beams']
+        info['analyzed_nodes_count'] = num_processed_nodes
+        info['analyzed_beams_count'] = num_processed_beams
+
+    failure = (result.get('detailed_analysis') or {}).get('failure_analysis')
+    if isinstance(failure, dict) and failure.get('beam_failure_modes'):
+        failure['beam_failure_modes'] = sorted(
+            ({**mode, 'beam_index': original} for mode in failure['beam_failure_modes']
+             for original in originals[mode['beam_index']] if mode['beam_index'] < len(originals)),
+            key=lambda mode: mode['beam_index']
+        )
+
+    redundancy = result.get('redundancy_analysis')
+    if isinstance(redundancy, dict):
+        for scenario in redundancy.get('member_removal', []):
+            scenario['beam_indices'] = expand([scenario['beam_index']])
+            scenario['beam_index'] = first(scenario['beam_index'])
+            scenario['critical_beam'] = first(scenario['critical_beam'])
+
+        for key in ('critical_members', 'members_causing_instability', 'members_causing_overstress', 'skipped_beams'):
+            if key in redundancy:
+                redundancy[key] = expand(redundancy[key])
+
+        collapse = redundancy.get('progressive_collapse')
+        if isinstance(collapse, dict) and 'sequence' in collapse:
+            for step in collapse['sequence']:
+                step['removed_beams'] = expand([step['removed_beam']])
+                step['removed_beam'] = first(step['removed_beam'])
+            collapse['removed_beams'] = expand(collapse['removed_beams'])
+
+    result['preprocessing'] = report
+    return result
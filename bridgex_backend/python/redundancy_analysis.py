@@ -0,0 +1,282 @@
+# redundancy_analysis.py
+# Análisis de redundancia N-1 (rutas alternativas de carga) y colapso progresivo
+
+import os
+import math
+import logging
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# Propiedades del material (mismas que calculate_realistic_stresses)
+E_MODULUS = 200e9  # Módulo de elasticidad (Pa)
+YIELD_STRENGTH = 250e6  # Límite elástico (Pa)
+BEAM_AREA = 0.01  # Área transversal asumida (m²)
+
+# Carga vertical por nodo cuando el diseño no define cargas (N, negativa hacia abajo)
+DEFAULT_NODE_LOAD = -5000
+
+# Tolerancia relativa para detectar mecanismos (matriz singular)
+MECHANISM_TOLERANCE = 1e-9
+
+# Número de escenarios evaluados por bloque en paralelo
+SCENARIO_CHUNK_SIZE = 256
+
+def node_coordinates(node):
+    """Obtener (x, y) de un nodo en formato lista o diccionario"""
+    if isinstance(node, dict):
+        return float(node.get('x', 0)), float(node.get('y', 0))
+    return float(node[0]), float(node[1])
+
+def parse_loads(loads, num_nodes):
+    """Normalizar cargas ({node, fx, fy} o [node, fy]) a un array (num_nodes, 2)"""
+    forces = np.zeros((num_nodes, 2))
+
+    for load in loads:
+        if isinstance(load, dict):
+            node, fx, fy = load.get('node'), load.get('fx', 0), load.get('fy', 0)
+        elif len(load) >= 3:
+            node, fx, fy = load[0], load[1], load[2]
+        else:
+            node, fx, fy = load[0], 0, load[1]
+
+        if node is not None and 0 <= int(node) < num_nodes:
+            forces[int(node)] += (fx or 0, fy or 0)
+
+    return forces
+
+def assemble_truss_system(nodes, beams, supports, loads):
+    """Ensamblar la matriz de rigidez de la armadura 2D articulada (2 DOF por nodo)"""
+    num_nodes = len(nodes)
+    coords = np.array([node_coordinates(n) for n in nodes]) / 100  # Convertir a metros
+
+    # Nodos de soporte articulados: se restringen ux, uy
+    support_set = {int(s) for s in supports if 0 <= int(s) < num_nodes}
+    free_dof_map = -np.ones(num_nodes * 2, dtype=int)
+    num_free = 0
+    for node in range(num_nodes):
+        if node not in support_set:
+            free_dof_map[2 * node] = num_free
+            free_dof_map[2 * node + 1] = num_free + 1
+            num_free += 2
+
+    # Vector de cargas en DOF libres
+    forces = parse_loads(loads, num_nodes)
+    if not np.any(forces):
+        logging.info(f"⚖️ Sin cargas definidas, aplicando {DEFAULT_NODE_LOAD} N por nodo libre")
+        forces[:, 1] = DEFAULT_NODE_LOAD
+    f = np.zeros(num_free)
+    for dof in range(num_nodes * 2):
+        if free_dof_map[dof] >= 0:
+            f[free_dof_map[dof]] = forces.flat[dof]
+
+    # Matriz de compatibilidad B (num_free x M): elongación = B^T u
+    num_beams = len(beams)
+    B = np.zeros((num_free, num_beams))
+    stiffness = np.zeros(num_beams)
+    skipped = []
+
+    for i, beam in enumerate(beams):
+        start, end = int(beam[0]), int(beam[1])
+        if not (0 <= start < num_nodes and 0 <= end < num_nodes) or start == end:
+            skipped.append(i)
+            continue
+
+        dx, dy = coords[end] - coords[start]
+        length = math.hypot(dx, dy)
+        if length <= 0:
+            skipped.append(i)
+            continue
+
+        c, s = dx / length, dy / length
+        for dof, value in zip((2 * start, 2 * start + 1, 2 * end, 2 * end + 1), (-c, -s, c, s)):
+            if free_dof_map[dof] >= 0:
+                B[free_dof_map[dof], i] = value
+        stiffness[i] = E_MODULUS * BEAM_AREA / length
+
+    K = (B * stiffness) @ B.T
+
+    return {
+        'K': K,
+        'f': f,
+        'B': B,
+        'stiffness': stiffness,
+        'num_free_dof': num_free,
+        'skipped_beams': skipped
+    }
+
+def factorize_base_system(K, f, B):
+    """Factorizar K una sola vez y obtener elongaciones base y G = B^T K^-1 B"""
+    if K.shape[0] == 0:
+        return np.zeros(B.shape[1]), np.zeros((B.shape[1], B.shape[1]))
+
+    # Cholesky falla si K no es definida positiva (mecanismo)
+    L = np.linalg.cholesky(K)
+    pivots = np.diag(L) ** 2
+    if pivots.min() < MECHANISM_TOLERANCE * np.diag(K).max():
+        raise np.linalg.LinAlgError("Matriz de rigidez singular")
+
+    # Con K = L L^T: B^T K^-1 B = W_B^T W_B y B^T K^-1 f = W_B^T w_f, donde W = L^-1 [f, B].
+    # Basta una sola resolución triangular con múltiples lados derechos
+    W = np.linalg.solve(L, np.column_stack([f, B]))
+    w_f, W_B = W[:, 0], W[:, 1:]
+
+    return W_B.T @ w_f, W_B.T @ W_B
+
+def evaluate_removal_chunk(members, elongations, G, stiffness):
+    """Evaluar escenarios N-1 de un bloque de miembros con actualizaciones Sherman-Morrison"""
+    k = stiffness[members]
+    denominators = 1 - k * G[members, members]
+    stable = denominators > MECHANISM_TOLERANCE
+
+    # alpha_e = k_e * delta_e / (1 - k_e * G_ee)
+    alpha = np.where(stable, k * elongations[members] / np.where(stable, denominators, 1), 0)
+
+    # Elongaciones tras retirar cada miembro: delta + G[:, e] * alpha_e
+    new_elongations = elongations[:, None] + G[:, members] * alpha[None, :]
+    stresses = np.abs(stiffness[:, None] * new_elongations) / BEAM_AREA
+    stresses[members, np.arange(len(members))] = 0
+
+    max_stresses = stresses.max(axis=0) if stresses.size else np.zeros(len(members))
+    critical = stresses.argmax(axis=0) if stresses.size else np.zeros(len(members), dtype=int)
+    overstressed = (stresses > YIELD_STRENGTH).sum(axis=0) if stresses.size else np.zeros(len(members), dtype=int)
+
+    return members, stable, max_stresses, critical, overstressed
+
+def remove_member(elongations, G, stiffness, member):
+    """Actualización de rango uno de elongaciones y G al retirar un miembro"""
+    k = stiffness[member]
+    denominator = 1 - k * G[member, member]
+    if denominator <= MECHANISM_TOLERANCE:
+        return None
+
+    z = G[:, member].copy()
+    new_elongations = elongations + z * (k * elongations[member] / denominator)
+    new_G = G + np.outer(z, z) * (k / denominator)
+
+    new_stiffness = stiffness.copy()
+    new_stiffness[member] = 0
+    return new_elongations, new_G, new_stiffness
+
+def validate_initial_member(initial_member, stiffness):
+    """Mensaje de error si el miembro inicial no es una viga activa del modelo (None si es válido)"""
+    if isinstance(initial_member, bool) or not isinstance(initial_member, (int, np.integer)):
+        return f"Miembro inicial inválido: {initial_member!r} no es un índice entero"
+    if not 0 <= initial_member < len(stiffness):
+        return f"Miembro inicial {initial_member} fuera de rango [0, {len(stiffness)})"
+    if stiffness[initial_member] <= 0:
+        return f"Miembro inicial {initial_member} fue omitido del análisis (longitud cero o nodos inválidos)"
+    return None
+
+def simulate_progressive_collapse(elongations, G, stiffness, initial_member, max_steps=None):
+    """Retirar miembros iterativamente: tras cada falla se elimina el miembro más sobreesforzado"""
+    max_steps = max_steps or len(stiffness)
+    sequence = []
+    member = initial_member
+    cause = 'initial_removal'
+
+    for step in range(max_steps):
+        updated = remove_member(elongations, G, stiffness, member)
+        if updated is None:
+            sequence.append({'step': step, 'removed_beam': int(member), 'cause': cause, 'is_stable': False})
+            return {'sequence': sequence, 'outcome': 'collapse', 'removed_beams': [s['removed_beam'] for s in sequence]}
+
+        elongations, G, stiffness = updated
+        stresses = np.abs(stiffness * elongations) / BEAM_AREA
+        max_stress = float(stresses.max()) if stresses.size else 0.0
+
+        sequence.append({
+            'step': step,
+            'removed_beam': int(member),
+            'cause': cause,
+            'is_stable': True,
+            'max_stress': max_stress,
+            'overstressed_beams': int((stresses > YIELD_STRENGTH).sum())
+        })
+
+        if max_stress <= YIELD_STRENGTH:
+            return {'sequence': sequence, 'outcome': 'arrested', 'removed_beams': [s['removed_beam'] for s in sequence]}
+
+        member = int(stresses.argmax())
+        cause = 'overstress'
+
+    return {'sequence': sequence, 'outcome': 'step_limit', 'removed_beams': [s['removed_beam'] for s in sequence]}
+
+def run_redundancy_analysis(data, progressive_collapse=False, initial_member=None, max_workers=None):
+    """Análisis N-1 de rutas alternativas de carga a partir de una sola factorización"""
+    logging.info("🔗 Ejecutando análisis de redundancia N-1")
+
+    nodes = data.get('nodes', [])
+    beams = data.get('beams', [])
+    supports = data.get('supports', [])
+    loads = data.get('loads', [])
+
+    if not nodes or not beams:
+        return {'error': 'Datos insuficientes', 'member_removal': []}
+
+    system = assemble_truss_system(nodes, beams, supports, loads)
+    stiffness = system['stiffness']
+
+    try:
+        elongations, G = factorize_base_system(system['K'], system['f'], system['B'])
+    except np.linalg.LinAlgError:
+        logging.warning("⚠️ Estructura base inestable: no se puede evaluar redundancia")
+        return {'error': 'Estructura base inestable (mecanismo)', 'member_removal': []}
+
+    base_stresses = np.abs(stiffness * elongations) / BEAM_AREA
+    base_max_stress = float(base_stresses.max())
+
+    # Evaluar escenarios por bloques en paralelo (numpy libera el GIL)
+    active = np.flatnonzero(stiffness > 0)
+    chunks = [active[i:i + SCENARIO_CHUNK_SIZE] for i in range(0, len(active), SCENARIO_CHUNK_SIZE)]
+    workers = max_workers or os.cpu_count() or 1
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda c: evaluate_removal_chunk(c, elongations, G, stiffness), chunks))
+
+    member_removal = []
+    for members, stable, max_stresses, critical, overstressed in results:
+        for j, member in enumerate(members):
+            is_stable = bool(stable[j])
+            max_stress = float(max_stresses[j]) if is_stable else None
+            member_removal.append({
+                'beam_index': int(member),
+                'is_stable': is_stable,
+                'max_stress': max_stress,
+                'critical_beam': int(critical[j]) if is_stable else None,
+                'overstressed_beams': int(overstressed[j]) if is_stable else None,
+                'safety_factor': round(YIELD_STRENGTH / max_stress, 2) if max_stress else None
+            })
+
+    unstable = [r['beam_index'] for r in member_removal if not r['is_stable']]
+    overstressing = [r['beam_index'] for r in member_removal if r['is_stable'] and r['overstressed_beams']]
+    robust = len(member_removal) - len(unstable) - len(overstressing)
+
+    result = {
+        'method': 'sherman_morrison_n_minus_1',
+        'base_max_stress': base_max_stress,
+        'base_safety_factor': round(YIELD_STRENGTH / base_max_stress, 2) if base_max_stress > 0 else None,
+        'member_removal': member_removal,
+        'critical_members': unstable + overstressing,
+        'members_causing_instability': unstable,
+        'members_causing_overstress': overstressing,
+        'redundancy_index': robust / len(member_removal) if member_removal else 0,
+        'skipped_beams': system['skipped_beams']
+    }
+
+    if progressive_collapse and len(active):
+        if initial_member is None:
+            # Por defecto, partir del miembro cuya pérdida es más desfavorable
+            initial_member = max(
+                member_removal,
+                key=lambda r: float('inf') if not r['is_stable'] else r['max_stress']
+            )['beam_index']
+
+        error = validate_initial_member(initial_member, stiffness)
+        if error:
+            logging.warning(f"⚠️ Colapso progresivo omitido: {error}")
+            result['progressive_collapse'] = {'error': error, 'initial_member': initial_member}
+        else:
+            result['progressive_collapse'] = simulate_progressive_collapse(elongations, G, stiffness, int(initial_member))
+
+    logging.info(f"✅ Redundancia N-1: {len(unstable)} miembros críticos por estabilidad, {len(overstressing)} por esfuerzo")
+    return result
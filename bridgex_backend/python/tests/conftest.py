@@ -0,0 +1,10 @@
+# conftest.py
+# Los módulos del servicio se importan directamente desde su directorio
+
+import os
+import sys
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if SERVICE_DIR not in sys.path:
+    sys.path.insert(0, SERVICE_DIR)
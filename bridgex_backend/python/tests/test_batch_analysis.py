@@ -0,0 +1,54 @@
+# test_batch_analysis.py
+# Reanudar un lote no debe duplicar filas ni heredar líneas corruptas
+
+import json
+
+from batch_analysis import run_batch, JsonlResultWriter
+
+VALID = {
+    'nodes': [[0, 0], [100, 0], [200, 0], [50, 80], [150, 80]],
+    'beams': [[0, 1], [1, 2], [0, 3], [3, 1], [1, 4], [4, 2], [3, 4]],
+    'supports': [0, 2],
+    'loads': [{'node': 3, 'fy': -2000}]
+}
+
+def write_corpus(path):
+    # Tres diseños válidos y uno que no es JSON
+    lines = [json.dumps(VALID)] * 3 + ['{no es json']
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+def read_rows(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+def test_resume_does_not_duplicate_error_rows(tmp_path):
+    corpus, output = tmp_path / 'designs.jsonl', tmp_path / 'results.jsonl'
+    write_corpus(corpus)
+
+    first = run_batch(str(corpus), str(output), workers=1)
+    second = run_batch(str(corpus), str(output), workers=1)
+
+    assert first['processed'] == 4 and first['failed'] == 1
+    assert second['processed'] == 0 and second['skipped'] == 4
+    assert len(read_rows(output)) == 4
+
+def test_retry_failed_reruns_only_errored_designs(tmp_path):
+    corpus, output = tmp_path / 'designs.jsonl', tmp_path / 'results.jsonl'
+    write_corpus(corpus)
+    run_batch(str(corpus), str(output), workers=1)
+
+    retried = run_batch(str(corpus), str(output), workers=1, retry_failed=True)
+
+    assert retried['processed'] == 1 and retried['skipped'] == 3
+    keys = [row['design_key'] for row in read_rows(output)]
+    assert keys.count('designs.jsonl:4') == 2
+    assert len(keys) == 5
+
+def test_partial_last_line_is_discarded_on_open(tmp_path):
+    output = tmp_path / 'results.jsonl'
+    output.write_text('{"design_key": "a"}\n{"design_key": "b", "sta', encoding='utf-8')
+
+    writer = JsonlResultWriter(str(output))
+    writer.write_rows([{'design_key': 'c'}])
+    writer.close()
+
+    assert [row['design_key'] for row in read_rows(output)] == ['a', 'c']
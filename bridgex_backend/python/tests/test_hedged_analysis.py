@@ -0,0 +1,112 @@
+# test_hedged_analysis.py
+# El modo cubierto debe entregar el resultado y terminar al ritmo del motor ganador
+
+import os
+import sys
+import json
+import time
+import subprocess
+
+import bridge_service
+from engine_scheduler import plan_engines
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Motor preferido lento que ignora la cancelación (peor caso: MATLAB bloqueado en una llamada)
+SLOW_ENGINE_SECONDS = 5
+
+RUNNER = f"""
+import time
+import bridge_service
+
+def slow_matlab(data, cancel_event=None):
+    time.sleep({SLOW_ENGINE_SECONDS})
+    raise RuntimeError('motor lento')
+
+bridge_service.matlab_analysis = slow_matlab
+bridge_service.main()
+"""
+
+DESIGN = {
+    'nodes': [[0, 0], [100, 0], [200, 0], [50, 80], [150, 80]],
+    'beams': [[0, 1], [1, 2], [0, 3], [3, 1], [1, 4], [4, 2], [3, 4]],
+    'supports': [0, 2],
+    'loads': [{'node': 3, 'fy': -2000}],
+    'analysis_options': {'latency_sensitive': True, 'hedge_delay': 0.2}
+}
+
+def run_service(tmp_path, design=DESIGN):
+    env = {**os.environ, 'BRIDGEX_ENGINE_HISTORY': str(tmp_path / 'engine_history.json')}
+    start = time.monotonic()
+    completed = subprocess.run(
+        [sys.executable, '-c', RUNNER],
+        input=json.dumps(design),
+        capture_output=True,
+        text=True,
+        cwd=SERVICE_DIR,
+        env=env,
+        timeout=SLOW_ENGINE_SECONDS * 3
+    )
+    return completed, time.monotonic() - start
+
+def test_hedged_process_exits_with_winner(tmp_path):
+    completed, elapsed = run_service(tmp_path)
+
+    assert completed.returncode == 0, completed.stderr
+    result = json.loads(completed.stdout)
+    attempts = {a['method']: a for a in result['analysis_attempts']}
+
+    assert result['backend'] == 'advanced_python'
+    assert attempts['advanced_python']['hedge_winner'] is True
+    assert attempts['matlab_engine']['status'] == 'cancelled'
+
+    # Sin salir explícitamente, el intérprete esperaría el hilo del motor lento
+    assert elapsed < SLOW_ENGINE_SECONDS - 1, f"el proceso tardó {elapsed:.2f}s"
+
+def test_hedged_losses_demote_slow_engine(tmp_path):
+    first, _ = run_service(tmp_path)
+    assert first.returncode == 0, first.stderr
+    cancelled = next(a for a in json.loads(first.stdout)['analysis_attempts'] if a['method'] == 'matlab_engine')
+
+    # El perdedor cancelado deja una cota inferior de su latencia en el historial
+    history = json.loads((tmp_path / 'engine_history.json').read_text(encoding='utf-8'))
+    bucket = next(iter(history.values()))
+    assert bucket['matlab_engine']['samples'] == 1
+    assert bucket['matlab_engine']['latency'] >= cancelled['processing_time']
+
+    # Con más margen antes de cubrir, el motor rápido no llega a necesitar a MATLAB
+    patient = {**DESIGN, 'analysis_options': {'latency_sensitive': True, 'hedge_delay': 2}}
+    for _ in range(2):
+        completed, elapsed = run_service(tmp_path, patient)
+        assert completed.returncode == 0, completed.stderr
+        result = json.loads(completed.stdout)
+        decision = result['analysis_attempts'][0]
+
+        # El motor rápido va primero y MATLAB ya no se lanza
+        assert decision['reason'] == 'lowest_expected_time'
+        assert decision['order'][0] == 'advanced_python'
+        assert [a['method'] for a in result['analysis_attempts'][1:]] == ['advanced_python']
+        assert elapsed < SLOW_ENGINE_SECONDS - 1
+
+    history = json.loads((tmp_path / 'engine_history.json').read_text(encoding='utf-8'))
+    bucket = next(iter(history.values()))
+    assert bucket['advanced_python']['samples'] == 3
+    assert bucket['matlab_engine']['decisions_since_run'] == 2
+
+def test_hedging_only_races_engines_with_required_accuracy(monkeypatch):
+    options = {'latency_sensitive': True, 'accuracy': 'high', 'hedge_delay': 0.2}
+    decision = plan_engines(DESIGN, {}, ['matlab_engine', 'advanced_python'], options)
+
+    # Solo MATLAB cumple la precisión: no hay con quién competir
+    assert decision['hedged'] is False
+    assert decision['order'] == ['matlab_engine', 'advanced_python']
+    assert decision['fallback'] == ['advanced_python']
+
+    def failing_matlab(data, cancel_event=None):
+        raise RuntimeError('sin licencia')
+
+    # El respaldo de menor precisión solo se usa cuando el motor elegible falló
+    monkeypatch.setattr(bridge_service, 'matlab_analysis', failing_matlab)
+    result = bridge_service.run_analysis({**DESIGN, 'analysis_options': options}, persist_history=False)
+    attempts = [(a['method'], a['status']) for a in result['analysis_attempts'][1:]]
+    assert attempts == [('matlab_engine', 'failed'), ('advanced_python', 'success')]
@@ -0,0 +1,98 @@
+# test_preprocessing.py
+# La limpieza geométrica no debe fusionar nodos en cadena y todo resultado vuelve a la numeración original
+
+import bridge_service
+from preprocessing import preprocess_bridge_data, map_result_to_original
+
+# Armadura base (5 nodos, 7 vigas) más elementos repetidos:
+# nodo 5 coincide con el nodo 3, viga 7 duplica la 2 (vía el nodo 5), viga 8 es de longitud cero
+# y viga 9 es la viga 6 con los extremos invertidos
+DIRTY = {
+    'nodes': [[0, 0], [100, 0], [200, 0], [50, 80], [150, 80], [50.4, 80.3]],
+    'beams': [[0, 1], [1, 2], [0, 3], [3, 1], [1, 4], [4, 2], [3, 4], [0, 5], [3, 5], [4, 3]],
+    'supports': [0, 2],
+    'loads': [{'node': 5, 'fy': -2000}]
+}
+
+def test_chained_nodes_are_not_merged_transitively():
+    # Cada nodo está a 0.9 del anterior: solo pares consecutivos quedan dentro de la tolerancia
+    design = {
+        'nodes': [[0.9 * i, 0] for i in range(20)],
+        'beams': [[0, 19]],
+        'supports': [0]
+    }
+    processed, report = preprocess_bridge_data(design, tolerance=1.0)
+
+    # Ningún grupo es más ancho que la tolerancia alrededor de su representante
+    for original, new in enumerate(report['node_map']):
+        assert abs(processed['nodes'][new][0] - design['nodes'][original][0]) <= 1.0
+
+    assert len(processed['nodes']) == 10
+    assert report['beam_map'] == [0]
+    assert processed['beams'] == [[0, report['node_map'][19]]]
+
+def test_report_maps_dirty_design_to_processed_model():
+    processed, report = preprocess_bridge_data(DIRTY)
+
+    assert report['node_map'] == [0, 1, 2, 3, 4, 3]
+    assert report['beam_map'] == [0, 1, 2, 3, 4, 5, 6, 2, None, 6]
+    assert report['zero_length_beams'] == [8]
+    assert report['duplicate_beams'] == 2
+    assert processed['beams'] == [[0, 1], [1, 2], [0, 3], [3, 1], [1, 4], [4, 2], [3, 4]]
+    assert processed['loads'] == [{'node': 3, 'fy': -2000}]
+
+def test_result_fields_round_trip_to_original_indices():
+    processed, report = preprocess_bridge_data(DIRTY)
+    result = {
+        'stresses': [10, 11, 12, 13, 14, 15, 16],
+        'analysis_info': {'nodes_count': 5, 'beams_count': 7},
+        'redundancy_analysis': {
+            'member_removal': [
+                {'beam_index': 2, 'critical_beam': 6},
+                {'beam_index': 6, 'critical_beam': 2}
+            ],
+            'critical_members': [6, 2],
+            'members_causing_instability': [2],
+            'members_causing_overstress': [],
+            'skipped_beams': [],
+            'progressive_collapse': {
+                'sequence': [{'step': 0, 'removed_beam': 6}],
+                'removed_beams': [6]
+            }
+        }
+    }
+
+    mapped = map_result_to_original(result, report, len(processed['nodes']), len(processed['beams']))
+
+    # Las vigas duplicadas reciben el esfuerzo de la conservada; la de longitud cero, 0
+    assert mapped['stresses'] == [10, 11, 12, 13, 14, 15, 16, 12, 0, 16]
+    assert mapped['analysis_info']['beams_count'] == 10
+    assert mapped['analysis_info']['analyzed_beams_count'] == 7
+
+    redundancy = mapped['redundancy_analysis']
+    assert redundancy['member_removal'][0] == {'beam_index': 2, 'beam_indices': [2, 7], 'critical_beam': 6}
+    assert redundancy['member_removal'][1] == {'beam_index': 6, 'beam_indices': [6, 9], 'critical_beam': 2}
+    assert redundancy['critical_members'] == [6, 9, 2, 7]
+    assert redundancy['members_causing_instability'] == [2, 7]
+    assert redundancy['progressive_collapse']['removed_beams'] == [6, 9]
+
+def test_service_reports_original_numbering_end_to_end():
+    options = {'redundancy': True, 'progressive_collapse': True, 'initial_member': 9}
+    result = bridge_service.run_analysis({**DIRTY, 'analysis_options': options}, use_matlab=False, persist_history=False)
+
+    assert len(result['stresses']) == len(DIRTY['beams'])
+    assert result['stresses'][7] == result['stresses'][2]
+    assert result['stresses'][8] == 0
+
+    redundancy = result['redundancy_analysis']
+    assert sorted(i for s in redundancy['member_removal'] for i in s['beam_indices']) == [0, 1, 2, 3, 4, 5, 6, 7, 9]
+    # El miembro 9 (duplicado de la 6) se traduce al modelo y se informa de vuelta como la 6 y la 9
+    assert redundancy['progressive_collapse']['removed_beams'][:2] == [6, 9]
+
+def test_removed_initial_member_is_reported_in_original_numbering():
+    options = {'redundancy': True, 'progressive_collapse': True, 'initial_member': 8}
+    result = bridge_service.run_analysis({**DIRTY, 'analysis_options': options}, use_matlab=False, persist_history=False)
+
+    collapse = result['redundancy_analysis']['progressive_collapse']
+    assert 'eliminado en el preprocesamiento' in collapse['error']
+    assert collapse['initial_member'] == 8
@@ -0,0 +1,89 @@
+# test_redundancy_analysis.py
+# Los escenarios N-1 por Sherman-Morrison deben coincidir con resolver de nuevo cada estructura
+
+import numpy as np
+import pytest
+
+from redundancy_analysis import (
+    BEAM_AREA,
+    assemble_truss_system,
+    run_redundancy_analysis
+)
+
+# Armadura con un solo miembro redundante: casi cualquier retiro produce un mecanismo
+DETERMINATE = {
+    'nodes': [[0, 0], [100, 0], [200, 0], [50, 80], [150, 80]],
+    'beams': [[0, 1], [1, 2], [0, 3], [3, 1], [1, 4], [4, 2], [3, 4]],
+    'supports': [0, 2],
+    'loads': [{'node': 3, 'fy': -2000}]
+}
+
+# Dos paneles con ambas diagonales: todos los retiros son estables
+REDUNDANT = {
+    'nodes': [[0, 0], [100, 0], [200, 0], [0, 100], [100, 100], [200, 100]],
+    'beams': [[0, 1], [1, 2], [3, 4], [4, 5], [0, 3], [1, 4], [2, 5], [0, 4], [1, 3], [1, 5], [2, 4]],
+    'supports': [0, 2],
+    'loads': [{'node': 4, 'fy': -10000}, {'node': 3, 'fx': 3000}]
+}
+
+def direct_removal(design, member):
+    """Reensamblar sin el miembro y resolver K u = f desde cero (None si es un mecanismo)"""
+    system = assemble_truss_system(design['nodes'], design['beams'], design['supports'], design['loads'])
+    stiffness = system['stiffness'].copy()
+    stiffness[member] = 0
+    K = (system['B'] * stiffness) @ system['B'].T
+
+    if np.linalg.matrix_rank(K) < K.shape[0]:
+        return None
+
+    u = np.linalg.solve(K, system['f'])
+    return np.abs(stiffness * (system['B'].T @ u)) / BEAM_AREA
+
+@pytest.mark.parametrize('design', [DETERMINATE, REDUNDANT], ids=['determinate', 'redundant'])
+def test_n_minus_1_matches_direct_solve(design):
+    result = run_redundancy_analysis(design)
+
+    assert len(result['member_removal']) == len(design['beams'])
+    for scenario in result['member_removal']:
+        stresses = direct_removal(design, scenario['beam_index'])
+
+        if stresses is None:
+            assert scenario['is_stable'] is False
+            assert scenario['max_stress'] is None
+            continue
+
+        assert scenario['is_stable'] is True
+        assert scenario['max_stress'] == pytest.approx(stresses.max(), rel=1e-6)
+        assert scenario['critical_beam'] == int(stresses.argmax())
+
+def test_mechanisms_are_reported_as_critical():
+    result = run_redundancy_analysis(DETERMINATE)
+
+    # Solo las cuerdas inferiores son redundantes con ambos apoyos articulados
+    assert result['members_causing_instability'] == [2, 3, 4, 5, 6]
+    assert result['critical_members'][:5] == [2, 3, 4, 5, 6]
+
+def test_unstable_base_structure_is_rejected():
+    design = {**DETERMINATE, 'supports': [0]}
+    result = run_redundancy_analysis(design)
+
+    assert result['error'] == 'Estructura base inestable (mecanismo)'
+    assert result['member_removal'] == []
+
+@pytest.mark.parametrize('initial_member', [-1, 12, 2.5, True, '3', 11])
+def test_invalid_initial_member_is_reported(initial_member):
+    # La viga 11 tiene longitud cero y queda fuera del modelo
+    design = {**REDUNDANT, 'beams': REDUNDANT['beams'] + [[1, 1]]}
+    result = run_redundancy_analysis(design, progressive_collapse=True, initial_member=initial_member)
+
+    collapse = result['progressive_collapse']
+    assert 'error' in collapse
+    assert 'sequence' not in collapse
+    assert collapse['initial_member'] == initial_member
+
+def test_valid_initial_member_starts_collapse_sequence():
+    result = run_redundancy_analysis(REDUNDANT, progressive_collapse=True, initial_member=7)
+
+    collapse = result['progressive_collapse']
+    assert collapse['removed_beams'][0] == 7
+    assert collapse['sequence'][0]['cause'] == 'initial_removal'
@@ -1,4 +1,5 @@
 import React, { useEffect, useRef, useState, useCallback } from "react";
+import Matter from 'matter-js';
 
 // Importar componentes
 import BuildingTools from './components/BuildingTools.jsx';
@@ -12,10 +13,11 @@ import ResultsPanel from './components/ResultsPanel.jsx';
 
 // Importar hooks personalizados
 import usePhysicsEngine from './hooks/usePhysicsEngine.jsx';
-import useBridgeElements from './hooks/useBridgeElements.jsx';
+import useBridgeElements, { removeStressLevel } from './hooks/useBridgeElements.jsx';
+import usePhysicsWorker, { STRESS_COLORS } from './hooks/usePhysicsWorker.jsx';
+import { createVehicleParts, beamSystemParts } from './physics/sceneBodies.js';
 
-// Matter.js importado desde CDN
-const { Engine, Render, Runner, World, Bodies, Body, Constraint, Mouse, MouseConstraint, Composite } = Matter;
+const { World, Composite } = Matter;
 
 // CONFIGURACIONES DE VEHÍCULOS MEJORADAS PARA ESTABILIDAD
 const VEHICLE_CONFIGS = {
@@ -222,7 +224,7 @@ export default function App() {
   }, []);
 
   // Hooks personalizados
-  const { engineRef, renderRef, initializeEngine, createTerrain } = usePhysicsEngine(settings, canvasSize);
+  const { engineRef, renderRef, runnerRef, initializeEngine, createTerrain } = usePhysicsEngine(settings, canvasSize);
 
   const {
     nodeBodies,
@@ -240,149 +242,119 @@ export default function App() {
     setBeamConstraints
   } = useBridgeElements(engineRef, () => updateStats());
 
-  // Función para actualizar estadísticas
-  const updateStats = useCallback(() => {
+  const {
+    startSimulation: startWorkerSimulation,
+    stopSimulation: stopWorkerSimulation,
+    updateOptions: updateSimulationOptions,
+    resetVisualization: resetStressVisualization,
+    invalidateRender: invalidateSimulationRender,
+    frameStats
+  } = usePhysicsWorker({ engineRef, renderRef, runnerRef }, {
+    onFrame: (frame, beamSystems) => handleSimulationFrame(frame, beamSystems),
+    onStopped: (final, beamSystems) => handleSimulationStopped(final, beamSystems)
+  });
+
+  // Función para actualizar estadísticas (durante la simulación el estrés medio llega del worker)
+  const updateStats = useCallback((averageStress) => {
     setGameStats(prev => {
       const cost = nodeBodies.length * 50 + beamConstraints.length * 100;
-      const avgStress = stressLevelsRef.current.reduce((a, b) => a + b, 0) /
+      const avgStress = averageStress ?? stressLevelsRef.current.reduce((a, b) => a + b, 0) /
         (stressLevelsRef.current.length || 1);
 
-      return {
+      const next = {
         nodes: nodeBodies.length,
         beams: beamConstraints.length,
         cost,
         stress: Math.round(avgStress * 100)
       };
+
+      // Evitar renders de React cuando el valor visible no cambió
+      return Object.keys(next).every(key => next[key] === prev[key]) ? prev : next;
     });
   }, [nodeBodies.length, beamConstraints.length, stressLevelsRef]);
 
-  // FUNCIÓN DE DETECCIÓN DE ESTRÉS ACTUALIZADA PARA SISTEMA HÍBRIDO
-  const detectAndBreakOverstressedBeams = useCallback(() => {
-    if (!beamConstraints.length) return;
-
-    const toRemove = [];
-    beamConstraints.forEach((beamSystem, i) => {
-      const meta = beamMetaRef.current[i];
-      if (!meta) return;
-
-      const node1 = nodeBodies[meta.startIdx];
-      const node2 = nodeBodies[meta.endIdx];
-      
-      if (!node1 || !node2) return;
-
-      const dx = node2.position.x - node1.position.x;
-      const dy = node2.position.y - node1.position.y;
-      const currentLength = Math.hypot(dx, dy);
-      const restLength = meta.originalLength;
-
-      // Calcular estrés basado en deformación
-      const deformationStress = Math.abs(currentLength - restLength) / restLength;
-      
-      // Estrés adicional por movimiento de la viga física (si existe)
-      let physicsStress = 0;
-      if (beamSystem.beamBody) {
-        const beamVelocity = Math.hypot(beamSystem.beamBody.velocity.x, beamSystem.beamBody.velocity.y);
-        const beamRotation = Math.abs(beamSystem.beamBody.angularVelocity);
-        physicsStress = (beamVelocity * 0.01) + (beamRotation * 0.1);
-      }
-      
-      const totalStress = deformationStress + physicsStress;
-      stressLevelsRef.current[i] = totalStress;
+  // ROTURA DE VIGAS: el worker ya las retiró de su mundo, aquí se retiran del mundo que se dibuja
+  const breakBeams = useCallback((brokenSystems) => {
+    const integrityLoss = brokenSystems.length * (15 + Math.random() * 10);
+    setBridgeIntegrity(prev => Math.max(0, prev - integrityLoss));
 
-      // Actualizar color del constraint visual basado en estrés
-      if (beamSystem.visualConstraint && beamSystem.visualConstraint.render) {
-        let color;
-        if (totalStress > 0.8) {
-          color = "#DC2626";
-        } else if (totalStress > 0.6) {
-          color = "#EA580C";
-        } else if (totalStress > 0.4) {
-          color = "#F59E0B";
-        } else if (totalStress > 0.2) {
-          color = "#84CC16";
-        } else {
-          color = "#10B981";
-        }
-        
-        beamSystem.visualConstraint.render.strokeStyle = color;
-        beamSystem.visualConstraint.render.lineWidth = Math.max(4, 4 + totalStress * 4);
-      }
+    brokenSystems.forEach(beamSystem => {
+      const idx = beamConstraints.indexOf(beamSystem);
+      if (idx < 0) return;
 
-      const adjustedThreshold = settings.stressThreshold * (1 + Math.random() * 0.2);
-      
-      if (totalStress > adjustedThreshold) {
-        toRemove.push(i);
-      }
+      // Remover todos los componentes del sistema híbrido
+      World.remove(engineRef.current.world, beamSystemParts(beamSystem));
+
+      beamConstraints.splice(idx, 1);
+      beamMetaRef.current.splice(idx, 1);
+      stressLevelsRef.current = removeStressLevel(stressLevelsRef.current, idx);
     });
 
-    if (toRemove.length > 0) {
-      const integrityLoss = toRemove.length * (15 + Math.random() * 10);
-      setBridgeIntegrity(prev => Math.max(0, prev - integrityLoss));
-
-      toRemove.sort((a, b) => b - a).forEach(idx => {
-        const beamSystem = beamConstraints[idx];
-        
-        // Remover todos los componentes del sistema híbrido
-        World.remove(engineRef.current.world, [
-          beamSystem.beamBody,
-          beamSystem.visualConstraint,
-          beamSystem.physicsConstraint1,
-          beamSystem.physicsConstraint2
-        ]);
-        
-        beamConstraints.splice(idx, 1);
-        beamMetaRef.current.splice(idx, 1);
-        stressLevelsRef.current.splice(idx, 1);
-      });
+    setBeamConstraints([...beamConstraints]);
 
-      setBeamConstraints([...beamConstraints]);
-      
-      if (toRemove.length >= 3) {
-        setBridgeIntegrity(prev => Math.max(0, prev - 30));
-        if (bridgeIntegrity <= 20) {
-          setGameStatus("failed");
-          setIsSimulating(false);
-        }
+    if (brokenSystems.length >= 3) {
+      setBridgeIntegrity(prev => Math.max(0, prev - 30));
+      if (bridgeIntegrity <= 20) {
+        setGameStatus("failed");
+        setIsSimulating(false);
       }
     }
-  }, [beamConstraints, settings.stressThreshold, nodeBodies, bridgeIntegrity, engineRef]);
-
-  // Función de visualización de estrés actualizada para sistema híbrido
-  const updateStressVisualization = useCallback(() => {
-    if (!settings.showStress) {
-      beamConstraints.forEach((beamSystem) => {
-        if (beamSystem.visualConstraint && beamSystem.visualConstraint.render) {
-          beamSystem.visualConstraint.render.strokeStyle = "#374151";
-          beamSystem.visualConstraint.render.lineWidth = 4;
+  }, [beamConstraints, bridgeIntegrity, engineRef]);
+
+  // FRAME DEL WORKER: los índices se refieren a la instantánea de vigas del inicio de la simulación
+  const handleSimulationFrame = useCallback((frame, beamSystems) => {
+    if (settings.showStress) {
+      const { deltaIndices, deltaBuckets, deltaWidths } = frame;
+      for (let j = 0; j < deltaIndices.length; j++) {
+        const render = beamSystems[deltaIndices[j]]?.visualConstraint?.render;
+        if (render) {
+          render.strokeStyle = STRESS_COLORS[deltaBuckets[j]];
+          render.lineWidth = deltaWidths[j];
         }
-      });
+      }
+    }
+
+    if (frame.broken.length > 0) {
+      breakBeams(Array.from(frame.broken, idx => beamSystems[idx]));
+    }
+
+    // Evitar renders de React cuando el valor visible no cambió
+    setVehicleProgress(prev => Math.round(prev) === Math.round(frame.progress) ? prev : frame.progress);
+    setVehicleAcceleration(prev => Math.round(prev) === Math.round(frame.acceleration) ? prev : frame.acceleration);
+    updateStats(frame.averageStress);
+
+    if (frame.status !== "testing") {
+      setGameStatus(frame.status);
+      setIsSimulating(false);
+    }
+  }, [settings.showStress, breakBeams, updateStats]);
+
+  // FIN DE SIMULACIÓN: vigas rotas pendientes y estrés final de las vigas restantes
+  const handleSimulationStopped = useCallback((final, beamSystems) => {
+    if (final.broken.length > 0) {
+      breakBeams(Array.from(final.broken, idx => beamSystems[idx]));
+    }
+    if (final.stresses.length === stressLevelsRef.current.length) {
+      stressLevelsRef.current.set(final.stresses);
+    }
+    updateStats();
+  }, [breakBeams, stressLevelsRef, updateStats]);
+
+  // Visualización de estrés: al desactivarla todas las vigas vuelven a gris
+  useEffect(() => {
+    if (settings.showStress) {
+      resetStressVisualization();
       return;
     }
 
-    beamConstraints.forEach((beamSystem, i) => {
-      const stressLevel = stressLevelsRef.current[i] || 0;
+    beamConstraints.forEach((beamSystem) => {
       if (beamSystem.visualConstraint && beamSystem.visualConstraint.render) {
-        let color;
-        
-        if (stressLevel > 0.9) {
-          color = "#B91C1C";
-        } else if (stressLevel > 0.7) {
-          color = "#DC2626";
-        } else if (stressLevel > 0.5) {
-          color = "#EA580C";
-        } else if (stressLevel > 0.3) {
-          color = "#F59E0B";
-        } else if (stressLevel > 0.1) {
-          color = "#84CC16";
-        } else {
-          color = "#10B981";
-        }
-        
-        beamSystem.visualConstraint.render.strokeStyle = color;
-        beamSystem.visualConstraint.render.lineWidth = Math.max(4, 4 + stressLevel * 4);
+        beamSystem.visualConstraint.render.strokeStyle = "#374151";
+        beamSystem.visualConstraint.render.lineWidth = 4;
       }
     });
-  }, [beamConstraints, settings.showStress, stressLevelsRef]);
+    invalidateSimulationRender();
+  }, [beamConstraints, settings.showStress, resetStressVisualization, invalidateSimulationRender]);
 
   // Inicialización del motor de física
   useEffect(() => {
@@ -398,6 +370,15 @@ export default function App() {
     }
   }, [settings.gravity]);
 
+  // Opciones de la simulación en curso (el worker las aplica sin reiniciar)
+  useEffect(() => {
+    updateSimulationOptions({
+      gravity: settings.gravity,
+      threshold: settings.stressThreshold,
+      autoBreak: settings.autoBreak
+    });
+  }, [settings.gravity, settings.stressThreshold, settings.autoBreak, updateSimulationOptions]);
+
   // Obtener posición del mouse (escalada para el nuevo tamaño)
   const getMousePos = useCallback((e) => {
     const rect = sceneRef.current?.querySelector("canvas")?.getBoundingClientRect();
@@ -478,125 +459,14 @@ export default function App() {
     const startX = canvasSize.width * 0.125;
     const startY = canvasSize.height - (canvasSize.height * 0.25);
 
-    const chassis = Bodies.rectangle(
-      startX,
-      startY,
-      config.chassis.width,
-      config.chassis.height,
-      {
-        density: config.chassis.density,
-        friction: config.physics.friction,
-        frictionAir: 0.01,
-        restitution: config.physics.restitution,
-        render: {
-          fillStyle: config.color.chassis,
-          strokeStyle: config.color.chassis.replace('4', '8'),
-          lineWidth: 2
-        },
-        collisionFilter: {
-          category: 0x0001,
-          mask: 0x0002 | 0x0008 | 0x0004
-        }
-      }
-    );
-
-    const wheelOffsetX = config.chassis.width * 0.35;
-
-    const wheelA = Bodies.circle(
-      startX - wheelOffsetX,
-      startY + config.wheels.offsetY,
-      config.wheels.radius,
-      {
-        density: config.wheels.density,
-        friction: config.physics.wheelFriction,
-        frictionAir: 0.005,
-        restitution: config.physics.restitution,
-        render: {
-          fillStyle: config.color.wheels,
-          strokeStyle: config.color.wheels.replace('4', '8'),
-          lineWidth: 2
-        },
-        collisionFilter: {
-          category: 0x0001,
-          mask: 0x0002 | 0x0008 | 0x0004
-        }
-      }
-    );
-
-    const wheelB = Bodies.circle(
-      startX + wheelOffsetX,
-      startY + config.wheels.offsetY,
-      config.wheels.radius,
-      {
-        density: config.wheels.density,
-        friction: config.physics.wheelFriction,
-        frictionAir: 0.005,
-        restitution: config.physics.restitution,
-        render: {
-          fillStyle: config.color.wheels,
-          strokeStyle: config.color.wheels.replace('4', '8'),
-          lineWidth: 2
-        },
-        collisionFilter: {
-          category: 0x0001,
-          mask: 0x0002 | 0x0008 | 0x0004
-        }
-      }
-    );
-
-    const axleA = Constraint.create({
-      bodyA: chassis,
-      pointA: { x: -wheelOffsetX, y: config.chassis.height / 2 },
-      bodyB: wheelA,
-      stiffness: config.physics.stiffness,
-      damping: config.physics.damping,
-      length: config.wheels.offsetY - config.chassis.height / 2,
-      render: { visible: false }
-    });
-
-    const axleB = Constraint.create({
-      bodyA: chassis,
-      pointA: { x: wheelOffsetX, y: config.chassis.height / 2 },
-      bodyB: wheelB,
-      stiffness: config.physics.stiffness,
-      damping: config.physics.damping,
-      length: config.wheels.offsetY - config.chassis.height / 2,
-      render: { visible: false }
-    });
-
-    const stabilizerA = Constraint.create({
-      bodyA: chassis,
-      pointA: { x: -wheelOffsetX * 0.5, y: -config.chassis.height / 3 },
-      bodyB: wheelA,
-      stiffness: config.physics.stiffness * 0.5,
-      damping: config.physics.damping * 1.5,
-      length: config.wheels.offsetY * 0.8,
-      render: { visible: false }
-    });
-
-    const stabilizerB = Constraint.create({
-      bodyA: chassis,
-      pointA: { x: wheelOffsetX * 0.5, y: -config.chassis.height / 3 },
-      bodyB: wheelB,
-      stiffness: config.physics.stiffness * 0.5,
-      damping: config.physics.damping * 1.5,
-      length: config.wheels.offsetY * 0.8,
-      render: { visible: false }
-    });
-
-    World.add(engineRef.current.world, [
-      chassis, wheelA, wheelB, 
-      axleA, axleB, 
-      stabilizerA, stabilizerB
-    ]);
+    const parts = createVehicleParts(config, startX, startY);
+    World.add(engineRef.current.world, Object.values(parts));
 
     const newVehicle = {
-      parts: { 
-        chassis, wheelA, wheelB, 
-        axleA, axleB, 
-        stabilizerA, stabilizerB 
-      },
+      parts,
       config: config,
+      startX,
+      startY,
       startTime: Date.now()
     };
 
@@ -614,83 +484,12 @@ export default function App() {
     return newVehicle;
   }, [vehicle, settings.vehicleType, engineRef, canvasSize]);
 
-  // SISTEMA DE MOVIMIENTO ACTUALIZADO CON ACELERACIÓN GRADUAL
+  // SISTEMA DE MOVIMIENTO: la conducción, la física y el estrés corren en el worker;
+  // al terminar la simulación (por cualquier causa) el motor del hilo principal se reanuda
   useEffect(() => {
-    if (!isSimulating || !vehicle?.parts) return;
-
-    const interval = setInterval(() => {
-      try {
-        const { chassis, wheelA, wheelB } = vehicle.parts;
-        const config = vehicle.config;
-        
-        // ACELERACIÓN GRADUAL - Los primeros 2 segundos
-        const elapsedTime = (Date.now() - vehicle.startTime) / 1000;
-        const accelerationPhase = Math.min(elapsedTime / 2, 1); // 2 segundos de aceleración gradual
-        
-        // Factor de aceleración suave (curva easing)
-        const accelerationCurve = 0.5 * (1 - Math.cos(accelerationPhase * Math.PI));
-        
-        // Aplicar torque gradualmente
-        const currentTorque = config.torque * accelerationCurve;
-        const currentSpeed = config.speed * accelerationCurve * 1000;
-        
-        // Aplicar torque a las ruedas de forma más suave
-        const maxAngularVelocity = 0.2 * accelerationCurve; // Velocidad angular máxima gradual
-        
-        Body.setAngularVelocity(wheelA, Math.min(wheelA.angularVelocity + currentTorque, maxAngularVelocity));
-        Body.setAngularVelocity(wheelB, Math.min(wheelB.angularVelocity + currentTorque, maxAngularVelocity));
-        
-        // Fuerza horizontal gradual
-        if (chassis.position.y > canvasSize.height - (canvasSize.height * 0.4)) {
-          Body.applyForce(chassis, chassis.position, { x: currentSpeed, y: 0 });
-        }
-        
-        // Control de estabilidad más suave
-        if (Math.abs(chassis.angle) > 0.3) {
-          const correctionTorque = -chassis.angle * 0.005 * accelerationCurve; // Más suave
-          Body.setAngularVelocity(chassis, chassis.angularVelocity + correctionTorque);
-        }
-
-        // Límite de velocidad gradual
-        const maxVelocity = 6 * accelerationCurve; // Velocidad máxima gradual
-        if (chassis.velocity.x > maxVelocity) {
-          Body.setVelocity(chassis, { x: maxVelocity, y: chassis.velocity.y });
-        }
-        if (wheelA.velocity.x > maxVelocity) {
-          Body.setVelocity(wheelA, { x: maxVelocity, y: wheelA.velocity.y });
-        }
-        if (wheelB.velocity.x > maxVelocity) {
-          Body.setVelocity(wheelB, { x: maxVelocity, y: wheelB.velocity.y });
-        }
-
-        const progress = Math.min((chassis.position.x - canvasSize.width * 0.125) / (canvasSize.width * 0.75) * 100, 100);
-        setVehicleProgress(progress);
-        setVehicleAcceleration(accelerationCurve * 100); // Para mostrar progreso de aceleración
-
-        if (progress >= 95) {
-          setGameStatus("success");
-          setIsSimulating(false);
-        }
-
-        if (chassis.position.y > canvasSize.height - (canvasSize.height * 0.15)) {
-          setGameStatus("failed");
-          setIsSimulating(false);
-        }
-
-        if (settings.autoBreak) {
-          detectAndBreakOverstressedBeams();
-        }
-
-        updateStressVisualization();
-
-      } catch (error) {
-        console.error("Error en simulación:", error);
-        setIsSimulating(false);
-      }
-    }, 16);
-
-    return () => clearInterval(interval);
-  }, [isSimulating, vehicle, settings, detectAndBreakOverstressedBeams, updateStressVisualization, canvasSize]);
+    if (!isSimulating) return;
+    return () => stopWorkerSimulation();
+  }, [isSimulating, stopWorkerSimulation]);
 
   // Exportar diseño
   const exportDesign = useCallback(() => {
@@ -749,13 +548,17 @@ export default function App() {
     if (!isSimulating) {
       // MANTENER NODOS ESTÁTICOS SIEMPRE - Solo permitir movimiento de vigas
       controlNodePhysics(false);
-      spawnVehicle();
+      const newVehicle = spawnVehicle();
+      startWorkerSimulation(nodeBodies, beamConstraints, beamMetaRef.current, newVehicle, {
+        threshold: settings.stressThreshold,
+        autoBreak: settings.autoBreak
+      });
       setIsSimulating(true);
     } else {
       controlNodePhysics(true);
       setIsSimulating(false);
     }
-  }, [isSimulating, vehicle, spawnVehicle, controlNodePhysics]);
+  }, [isSimulating, spawnVehicle, controlNodePhysics, startWorkerSimulation, nodeBodies, beamConstraints, beamMetaRef, settings.stressThreshold, settings.autoBreak]);
 
   return (
     <div className="min-h-screen bg-gradient-to-br from-blue-50 to-green-50">
@@ -871,7 +674,7 @@ export default function App() {
 
             {/* Stats Panel - Siempre visible en desktop */}
             <div className={showStats || window.innerWidth >= 1280 ? 'block' : 'hidden'}>
-              <StatsPanel gameStats={gameStats} />
+              <StatsPanel gameStats={gameStats} frameStats={frameStats} />
             </div>
 
             {/* Settings Panel */}
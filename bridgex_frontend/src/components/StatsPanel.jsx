@@ -1,7 +1,7 @@
 import React from 'react';
 import { Info } from 'lucide-react';
 
-const StatsPanel = ({ gameStats }) => {
+const StatsPanel = ({ gameStats, frameStats }) => {
   return (
     <div className="bg-white rounded-lg shadow-md p-3 md:p-4">
       <h3 className="text-base md:text-lg font-bold text-gray-800 mb-2 md:mb-3 flex items-center gap-2">
@@ -36,6 +36,20 @@ const StatsPanel = ({ gameStats }) => {
         </div>
       </div>
 
+      {/* Rendimiento durante la simulación: la física corre en un worker */}
+      {frameStats && (
+        <div className="mt-3 pt-2 border-t border-gray-100 space-y-1 text-xs text-gray-500">
+          <div className="flex justify-between">
+            <span>Hilo principal:</span>
+            <span className="font-mono">{frameStats.mainThreadMs.toFixed(2)} ms/frame</span>
+          </div>
+          <div className="flex justify-between">
+            <span>Física (worker):</span>
+            <span className="font-mono">{frameStats.workerStepMs.toFixed(2)} ms/paso</span>
+          </div>
+        </div>
+      )}
+
       {/* Indicadores visuales para móvil */}
       <div className="md:hidden mt-3 grid grid-cols-2 gap-2">
         <div className="bg-gray-50 p-2 rounded text-center">
@@ -1,11 +1,31 @@
 import { useState, useRef, useCallback } from 'react';
+import Matter from 'matter-js';
+import { createNodeBody, createBeamSystem, beamSystemParts } from '../physics/sceneBodies.js';
 
-// Matter.js importado desde CDN
-const { Bodies, Body, World, Constraint, Composite } = Matter;
+const { Body, World } = Matter;
 
 const DEFAULT_AREA = 1e-4;
 const DEFAULT_YIELD = 250e6;
 
+// Niveles de estrés en Float32Array: la vista crece sobre un buffer con capacidad extra
+export const appendStressLevel = (levels) => {
+  const capacity = levels.buffer.byteLength / Float32Array.BYTES_PER_ELEMENT;
+  if (levels.length < capacity) {
+    const view = new Float32Array(levels.buffer, 0, levels.length + 1);
+    view[levels.length] = 0;
+    return view;
+  }
+  const grown = new Float32Array(new ArrayBuffer(Math.max(16, capacity * 2) * Float32Array.BYTES_PER_ELEMENT), 0, levels.length + 1);
+  grown.set(levels);
+  return grown;
+};
+
+// Eliminar un nivel desplazando el resto sobre el mismo buffer (sin splice)
+export const removeStressLevel = (levels, idx) => {
+  levels.copyWithin(idx, idx + 1);
+  return levels.subarray(0, levels.length - 1);
+};
+
 const useBridgeElements = (engineRef, updateStats) => {
   const [nodeBodies, setNodeBodies] = useState([]);
   const [beamConstraints, setBeamConstraints] = useState([]);
@@ -13,35 +33,12 @@ const useBridgeElements = (engineRef, updateStats) => {
   
   const nodeMetaRef = useRef([]);
   const beamMetaRef = useRef([]);
-  const stressLevelsRef = useRef([]);
+  const stressLevelsRef = useRef(new Float32Array(0));
 
   const addNode = useCallback((x, y, isSupport = false, isLoad = false) => {
     if (!engineRef.current) return;
 
-    const radius = isSupport ? 15 : (isLoad ? 12 : 8);
-    const color = isSupport ? "#10B981" : (isLoad ? "#F59E0B" : "#3B82F6");
-    
-    const node = Bodies.circle(x, y, radius, {
-      inertia: Infinity,
-      friction: 1.0,
-      restitution: 0.05,
-      frictionAir: 0.1,
-      density: 0.001, // Densidad uniforme para todos los nodos
-      render: { 
-        fillStyle: color,
-        strokeStyle: "#1F2937",
-        lineWidth: 3
-      },
-      collisionFilter: {
-        category: 0x0004, // Categoría de nodos
-        mask: 0x0001 | 0x0008 // Colisiona con vehículos y terreno
-      },
-      isSupport,
-      isLoad
-    });
-
-    // TODOS LOS NODOS SON ESTÁTICOS SIEMPRE
-    Body.setStatic(node, true);
+    const node = createNodeBody(x, y, isSupport, isLoad);
     World.add(engineRef.current.world, node);
 
     const id = nextNodeId;
@@ -73,92 +70,10 @@ const useBridgeElements = (engineRef, updateStats) => {
     
     if (exists) return;
 
-    const len = Math.hypot(bodyB.position.x - bodyA.position.x, bodyB.position.y - bodyA.position.y);
-    
-    // Calcular posición y ángulo de la viga
-    const centerX = (bodyA.position.x + bodyB.position.x) / 2;
-    const centerY = (bodyA.position.y + bodyB.position.y) / 2;
-    const angle = Math.atan2(bodyB.position.y - bodyA.position.y, bodyB.position.x - bodyA.position.x);
-
-    // CREAR CUERPO FÍSICO INVISIBLE PARA COLISIÓN (pero más estable)
-    const beamBody = Bodies.rectangle(
-      centerX,
-      centerY,
-      len,
-      6, // Grosor para colisión
-      {
-        angle: angle,
-        isStatic: false,
-        density: 0.001, // Muy liviano para que no afecte mucho la física
-        friction: 0.8,
-        restitution: 0.01,
-        frictionAir: 0.01,
-        render: {
-          visible: false // INVISIBLE - no se dibuja
-        },
-        collisionFilter: {
-          category: 0x0002,
-          mask: 0x0001 // Solo colisiona con vehículos
-        }
-      }
-    );
-
-    // CONSTRAINT VISUAL entre nodos (lo que se ve)
-    const visualConstraint = Constraint.create({
-      bodyA: bodyA,
-      bodyB: bodyB,
-      length: len,
-      stiffness: 0.9,
-      damping: 0.1,
-      render: {
-        visible: true,
-        lineWidth: 4,
-        strokeStyle: "#374151",
-        type: "line"
-      }
-    });
-
-    // CONSTRAINTS FÍSICOS para conectar el cuerpo invisible a los nodos
-    const physicsConstraint1 = Constraint.create({
-      bodyA: bodyA,
-      bodyB: beamBody,
-      pointB: { x: -len/2, y: 0 },
-      stiffness: 0.9,
-      damping: 0.1,
-      length: 0,
-      render: { visible: false }
-    });
-
-    const physicsConstraint2 = Constraint.create({
-      bodyA: bodyB,
-      bodyB: beamBody,
-      pointB: { x: len/2, y: 0 },
-      stiffness: 0.9,
-      damping: 0.1,
-      length: 0,
-      render: { visible: false }
-    });
+    const beamSystem = createBeamSystem(bodyA, bodyB);
 
     // Agregar todo al mundo
-    World.add(engineRef.current.world, [
-      beamBody, 
-      visualConstraint, 
-      physicsConstraint1, 
-      physicsConstraint2
-    ]);
-
-    // Sistema de viga híbrido
-    const beamSystem = {
-      beamBody: beamBody, // Para colisión física
-      visualConstraint: visualConstraint, // Para visualización
-      physicsConstraint1: physicsConstraint1,
-      physicsConstraint2: physicsConstraint2,
-      constraint: visualConstraint, // Para compatibilidad con código de estrés
-      length: len,
-      bodyA: bodyA,
-      bodyB: bodyB,
-      render: visualConstraint.render
-    };
+    World.add(engineRef.current.world, beamSystemParts(beamSystem));
 
     const id = beamMetaRef.current.length;
     beamMetaRef.current.push({ 
@@ -169,12 +84,12 @@ const useBridgeElements = (engineRef, updateStats) => {
       endIdx: endIdx,
       area, 
       yield: yieldStrength,
-      originalLength: len,
+      originalLength: beamSystem.length,
       constraint: beamSystem
     });
     
     setBeamConstraints(prev => [...prev, beamSystem]);
-    stressLevelsRef.current.push(0);
+    stressLevelsRef.current = appendStressLevel(stressLevelsRef.current);
     
     updateStats();
     return id;
@@ -202,16 +117,11 @@ const useBridgeElements = (engineRef, updateStats) => {
         const beamSystem = beamConstraints[constraintIdx];
         
         // Remover todos los componentes del sistema híbrido
-        World.remove(engineRef.current.world, [
-          beamSystem.beamBody,
-          beamSystem.visualConstraint,
-          beamSystem.physicsConstraint1,
-          beamSystem.physicsConstraint2
-        ]);
+        World.remove(engineRef.current.world, beamSystemParts(beamSystem));
         
         beamConstraints.splice(constraintIdx, 1);
         beamMetaRef.current.splice(constraintIdx, 1);
-        stressLevelsRef.current.splice(constraintIdx, 1);
+        stressLevelsRef.current = removeStressLevel(stressLevelsRef.current, constraintIdx);
       });
 
       // Remover el nodo
@@ -258,16 +168,11 @@ const useBridgeElements = (engineRef, updateStats) => {
       const beamSystem = beamConstraints[beamIdx];
       
       // Remover todos los componentes del sistema híbrido
-      World.remove(engineRef.current.world, [
-        beamSystem.beamBody,
-        beamSystem.visualConstraint,
-        beamSystem.physicsConstraint1,
-        beamSystem.physicsConstraint2
-      ]);
+      World.remove(engineRef.current.world, beamSystemParts(beamSystem));
       
       beamConstraints.splice(beamIdx, 1);
       beamMetaRef.current.splice(beamIdx, 1);
-      stressLevelsRef.current.splice(beamIdx, 1);
+      stressLevelsRef.current = removeStressLevel(stressLevelsRef.current, beamIdx);
 
       setBeamConstraints([...beamConstraints]);
       updateStats();
@@ -291,7 +196,7 @@ const useBridgeElements = (engineRef, updateStats) => {
   const resetElements = useCallback(() => {
     nodeMetaRef.current = [];
     beamMetaRef.current = [];
-    stressLevelsRef.current = [];
+    stressLevelsRef.current = new Float32Array(0);
     setNodeBodies([]);
     setBeamConstraints([]);
     setNextNodeId(0);
@@ -0,0 +1,185 @@
+import { useEffect, useRef, useState, useCallback } from 'react';
+import Matter from 'matter-js';
+import { VEHICLE_BODY_KEYS } from '../physics/sceneBodies.js';
+import { createSimulationRenderer } from '../physics/simulationRenderer.js';
+
+const { Body, Render, Runner } = Matter;
+
+// Colores por nivel de estrés (índice = bucket calculado en el worker)
+export const STRESS_COLORS = ["#10B981", "#84CC16", "#F59E0B", "#EA580C", "#DC2626", "#B91C1C"];
+
+// Peso de la muestra más reciente en el tiempo por frame del hilo principal
+const TIMING_ALPHA = 0.1;
+
+// Intervalo de actualización de las métricas de rendimiento en la UI (ms)
+const STATS_INTERVAL = 500;
+
+const applyVehicleState = (vehicleParts, packed, stride) => {
+  VEHICLE_BODY_KEYS.forEach((key, j) => {
+    const body = vehicleParts[key];
+    const k = j * stride;
+    Body.setPosition(body, { x: packed[k], y: packed[k + 1] });
+    Body.setAngle(body, packed[k + 2]);
+    if (stride === 6) {
+      Body.setVelocity(body, { x: packed[k + 3], y: packed[k + 4] });
+      Body.setAngularVelocity(body, packed[k + 5]);
+    }
+  });
+};
+
+// Durante la simulación el motor de física corre en el worker; el hilo principal solo
+// dibuja desde los estados recibidos. Al detenerla, el Runner y Render de Matter se reanudan.
+const usePhysicsWorker = ({ engineRef, renderRef, runnerRef }, { onFrame, onStopped }) => {
+  const workerRef = useRef(null);
+  const versionRef = useRef(0);
+  const simulationRef = useRef(null);
+  const callbacksRef = useRef({ onFrame, onStopped });
+  const timingRef = useRef({ handler: 0, lastStats: 0 });
+  const [frameStats, setFrameStats] = useState(null);
+
+  callbacksRef.current = { onFrame, onStopped };
+
+  useEffect(() => {
+    const worker = new Worker(new URL('../workers/physicsWorker.js', import.meta.url), { type: 'module' });
+
+    worker.onmessage = (event) => {
+      const msg = event.data;
+      const simulation = simulationRef.current;
+
+      if (msg.type === 'stopped') {
+        // El vehículo continúa en el motor del hilo principal desde el estado final del worker
+        if (simulation?.stopping && msg.version === simulation.version) {
+          applyVehicleState(simulation.vehicleParts, msg.vehicle, 6);
+          callbacksRef.current.onStopped?.(msg, simulation.beamSystems);
+          simulationRef.current = null;
+        }
+        return;
+      }
+
+      // Ignorar frames de una simulación que ya terminó
+      if (msg.type !== 'frame' || !simulation || simulation.stopping || msg.version !== simulation.version) return;
+
+      const start = performance.now();
+      applyVehicleState(simulation.vehicleParts, msg.vehicle, 3);
+      callbacksRef.current.onFrame?.(msg, simulation.beamSystems);
+      if (msg.deltaIndices.length > 0 || msg.broken.length > 0) {
+        simulation.renderer.invalidate();
+      }
+      worker.postMessage({ type: 'ack', version: msg.version });
+
+      // Métricas: tiempo del hilo principal por frame (mensaje + dibujo) frente al paso del worker
+      const timing = timingRef.current;
+      const elapsed = performance.now() - start;
+      timing.handler = timing.handler ? (1 - TIMING_ALPHA) * timing.handler + TIMING_ALPHA * elapsed : elapsed;
+      if (start - timing.lastStats >= STATS_INTERVAL) {
+        timing.lastStats = start;
+        setFrameStats({
+          mainThreadMs: timing.handler + simulation.renderer.getDrawTime(),
+          workerStepMs: msg.stepTime,
+          beams: simulation.beamSystems.length
+        });
+      }
+    };
+
+    workerRef.current = worker;
+    return () => {
+      worker.terminate();
+      workerRef.current = null;
+      simulationRef.current?.renderer.stop();
+      simulationRef.current = null;
+    };
+  }, []);
+
+  const startSimulation = useCallback((nodeBodies, beamConstraints, beamMeta, vehicle, options) => {
+    const engine = engineRef.current;
+    const render = renderRef.current;
+    if (!workerRef.current || !engine || !render || !vehicle?.parts) return;
+
+    // La geometría viaja una sola vez por simulación, no en cada frame
+    const nodes = new Float32Array(nodeBodies.length * 4);
+    nodeBodies.forEach((body, i) => {
+      nodes[i * 4] = body.position.x;
+      nodes[i * 4 + 1] = body.position.y;
+      nodes[i * 4 + 2] = body.isSupport ? 1 : 0;
+      nodes[i * 4 + 3] = body.isLoad ? 1 : 0;
+    });
+
+    const beamStart = new Int32Array(beamMeta.length);
+    const beamEnd = new Int32Array(beamMeta.length);
+    beamMeta.forEach((meta, i) => {
+      beamStart[i] = meta.startIdx;
+      beamEnd[i] = meta.endIdx;
+    });
+
+    // El motor del hilo principal se pausa: su mundo solo se usa para dibujar
+    Runner.stop(runnerRef.current);
+    Render.stop(render);
+
+    const vehicleParts = vehicle.parts;
+    const renderer = createSimulationRenderer(
+      render,
+      engine.world,
+      VEHICLE_BODY_KEYS.map((key) => vehicleParts[key])
+    );
+    renderer.start();
+
+    versionRef.current += 1;
+    simulationRef.current = {
+      version: versionRef.current,
+      // Los índices del worker se refieren a esta instantánea (estable aunque se rompan vigas)
+      beamSystems: [...beamConstraints],
+      vehicleParts,
+      renderer,
+      stopping: false
+    };
+
+    workerRef.current.postMessage({
+      type: 'start',
+      version: versionRef.current,
+      canvasSize: { width: render.options.width, height: render.options.height },
+      gravity: engine.gravity.y,
+      nodes,
+      beamStart,
+      beamEnd,
+      vehicle: { config: vehicle.config, startX: vehicle.startX, startY: vehicle.startY },
+      options
+    }, [nodes.buffer, beamStart.buffer, beamEnd.buffer]);
+  }, [engineRef, renderRef, runnerRef]);
+
+  const stopSimulation = useCallback(() => {
+    const simulation = simulationRef.current;
+    if (!simulation || simulation.stopping) return;
+
+    simulation.stopping = true;
+    simulation.renderer.stop();
+    workerRef.current?.postMessage({ type: 'stop' });
+
+    if (renderRef.current) Render.run(renderRef.current);
+    if (runnerRef.current && engineRef.current) Runner.run(runnerRef.current, engineRef.current);
+    setFrameStats(null);
+  }, [engineRef, renderRef, runnerRef]);
+
+  const updateOptions = useCallback((options) => {
+    workerRef.current?.postMessage({ type: 'options', options });
+  }, []);
+
+  const resetVisualization = useCallback(() => {
+    workerRef.current?.postMessage({ type: 'resetVisual' });
+  }, []);
+
+  // Regenerar la capa estática tras cambiar estilos desde el hilo principal
+  const invalidateRender = useCallback(() => {
+    simulationRef.current?.renderer.invalidate();
+  }, []);
+
+  return {
+    startSimulation,
+    stopSimulation,
+    updateOptions,
+    resetVisualization,
+    invalidateRender,
+    frameStats
+  };
+};
+
+export default usePhysicsWorker;
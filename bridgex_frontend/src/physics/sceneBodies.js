@@ -0,0 +1,452 @@
+// Construcción de los cuerpos de la escena, compartida por el hilo principal y el worker de física.
+import Matter from 'matter-js';
+
+const { Bodies, Body, Constraint } = Matter;
+
+// Configuración del motor (la misma en ambos hilos para que la simulación sea equivalente)
+export const configureEngine = (engine, gravity) => {
+  engine.gravity.y = gravity;
+  engine.gravity.scale = 0.001;
+
+  engine.world.gravity.y = gravity;
+
+  engine.timing.timeScale = 1;
+  engine.constraintIterations = 3;
+  engine.positionIterations = 8;
+  engine.velocityIterations = 6;
+};
+
+export const createTerrainBodies = (canvasSize) => {
+  const { width: CANVAS_WIDTH, height: CANVAS_HEIGHT } = canvasSize;
+  
+  // Suelo principal escalado
+  const ground = Bodies.rectangle(CANVAS_WIDTH/2, CANVAS_HEIGHT - 20, CANVAS_WIDTH, 40, { 
+    isStatic: true, 
+    render: { 
+      fillStyle: "#2d3748",
+      strokeStyle: "#4a5568",
+      lineWidth: 2
+    },
+    friction: 1.0,
+    restitution: 0.1,
+    collisionFilter: {
+      category: 0x0008,
+      mask: 0x0001 | 0x0002 | 0x0004
+    }
+  });
+
+  // Calcular dimensiones proporcionales
+  const platformWidth = CANVAS_WIDTH * 0.17; // 17% del ancho
+  const platformHeight = CANVAS_HEIGHT * 0.17; // 17% de la altura
+  const platformOffset = CANVAS_WIDTH * 0.125; // 12.5% desde los bordes
+  
+  // PLATAFORMA IZQUIERDA escalada
+  const leftPlatformBase = Bodies.rectangle(
+    platformOffset, 
+    CANVAS_HEIGHT - 60, 
+    platformWidth, 
+    platformHeight, 
+    {
+      isStatic: true,
+      render: { 
+        fillStyle: "#4a5568",
+        strokeStyle: "#2d3748",
+        lineWidth: 3
+      },
+      friction: 1.0,
+      restitution: 0.1,
+      collisionFilter: {
+        category: 0x0008,
+        mask: 0x0001 | 0x0002 | 0x0004
+      }
+    }
+  );
+
+  // Superficie superior de la plataforma izquierda
+  const leftPlatformTop = Bodies.rectangle(
+    platformOffset, 
+    CANVAS_HEIGHT - 110, 
+    platformWidth * 0.9, 
+    8, 
+    {
+      isStatic: true,
+      render: { 
+        fillStyle: "#374151",
+        strokeStyle: "#1f2937",
+        lineWidth: 2
+      },
+      friction: 2.0,
+      restitution: 0.05,
+      collisionFilter: {
+        category: 0x0008,
+        mask: 0x0001 | 0x0002 | 0x0004
+      }
+    }
+  );
+
+  // PLATAFORMA DERECHA escalada
+  const rightPlatformBase = Bodies.rectangle(
+    CANVAS_WIDTH - platformOffset, 
+    CANVAS_HEIGHT - 60, 
+    platformWidth, 
+    platformHeight, 
+    {
+      isStatic: true,
+      render: { 
+        fillStyle: "#4a5568",
+        strokeStyle: "#2d3748",
+        lineWidth: 3
+      },
+      friction: 1.0,
+      restitution: 0.1,
+      collisionFilter: {
+        category: 0x0008,
+        mask: 0x0001 | 0x0002 | 0x0004
+      }
+    }
+  );
+
+  // Superficie superior de la plataforma derecha
+  const rightPlatformTop = Bodies.rectangle(
+    CANVAS_WIDTH - platformOffset, 
+    CANVAS_HEIGHT - 110, 
+    platformWidth * 0.9, 
+    8, 
+    {
+      isStatic: true,
+      render: { 
+        fillStyle: "#374151",
+        strokeStyle: "#1f2937",
+        lineWidth: 2
+      },
+      friction: 2.0,
+      restitution: 0.05,
+      collisionFilter: {
+        category: 0x0008,
+        mask: 0x0001 | 0x0002 | 0x0004
+      }
+    }
+  );
+
+  // RAMPAS DE ACCESO escaladas
+  const rampWidth = CANVAS_WIDTH * 0.04; // 4% del ancho
+  const leftRampX = platformOffset + (platformWidth * 0.45);
+  const rightRampX = CANVAS_WIDTH - platformOffset - (platformWidth * 0.45);
+  
+  const leftRamp = Bodies.rectangle(
+    leftRampX, 
+    CANVAS_HEIGHT - 100, 
+    rampWidth, 
+    6, 
+    {
+      isStatic: true,
+      angle: -0.1,
+      render: { 
+        fillStyle: "#6b7280",
+        strokeStyle: "#374151",
+        lineWidth: 2
+      },
+      friction: 1.5,
+      restitution: 0.05,
+      collisionFilter: {
+        category: 0x0008,
+        mask: 0x0001 | 0x0002 | 0x0004
+      }
+    }
+  );
+
+  const rightRamp = Bodies.rectangle(
+    rightRampX, 
+    CANVAS_HEIGHT - 100, 
+    rampWidth, 
+    6, 
+    {
+      isStatic: true,
+      angle: 0.1,
+      render: { 
+        fillStyle: "#6b7280",
+        strokeStyle: "#374151",
+        lineWidth: 2
+      },
+      friction: 1.5,
+      restitution: 0.05,
+      collisionFilter: {
+        category: 0x0008,
+        mask: 0x0001 | 0x0002 | 0x0004
+      }
+    }
+  );
+
+  // Agua entre las plataformas escalada
+  const waterWidth = CANVAS_WIDTH * 0.57; // 57% del ancho
+  const water = Bodies.rectangle(
+    CANVAS_WIDTH/2, 
+    CANVAS_HEIGHT - 50, 
+    waterWidth, 
+    30, 
+    {
+      isStatic: true,
+      isSensor: true,
+      render: { 
+        fillStyle: "#4299e1",
+        strokeStyle: "#3182ce",
+        lineWidth: 1
+      }
+    }
+  );
+
+  // MUROS LATERALES INVISIBLES
+  const leftWall = Bodies.rectangle(-10, CANVAS_HEIGHT/2, 20, CANVAS_HEIGHT, {
+    isStatic: true,
+    render: { fillStyle: "transparent" },
+    collisionFilter: {
+      category: 0x0008,
+      mask: 0x0001
+    }
+  });
+
+  const rightWall = Bodies.rectangle(CANVAS_WIDTH + 10, CANVAS_HEIGHT/2, 20, CANVAS_HEIGHT, {
+    isStatic: true,
+    render: { fillStyle: "transparent" },
+    collisionFilter: {
+      category: 0x0008,
+      mask: 0x0001
+    }
+  });
+
+  // TECHO INVISIBLE
+  const ceiling = Bodies.rectangle(CANVAS_WIDTH/2, -50, CANVAS_WIDTH * 2, 100, {
+    isStatic: true,
+    render: { fillStyle: "transparent" },
+    collisionFilter: {
+      category: 0x0008,
+      mask: 0x0001 | 0x0002 | 0x0004
+    }
+  });
+
+  return [
+    ground,
+    leftPlatformBase, leftPlatformTop, leftRamp,
+    rightPlatformBase, rightPlatformTop, rightRamp,
+    water,
+    leftWall, rightWall, ceiling
+  ];
+};
+
+// Nodo del puente: siempre estático, el radio depende del tipo
+export const createNodeBody = (x, y, isSupport = false, isLoad = false) => {
+  const radius = isSupport ? 15 : (isLoad ? 12 : 8);
+  const color = isSupport ? "#10B981" : (isLoad ? "#F59E0B" : "#3B82F6");
+
+  const node = Bodies.circle(x, y, radius, {
+    inertia: Infinity,
+    friction: 1.0,
+    restitution: 0.05,
+    frictionAir: 0.1,
+    density: 0.001, // Densidad uniforme para todos los nodos
+    render: {
+      fillStyle: color,
+      strokeStyle: "#1F2937",
+      lineWidth: 3
+    },
+    collisionFilter: {
+      category: 0x0004, // Categoría de nodos
+      mask: 0x0001 | 0x0008 // Colisiona con vehículos y terreno
+    },
+    isSupport,
+    isLoad
+  });
+
+  // TODOS LOS NODOS SON ESTÁTICOS SIEMPRE
+  Body.setStatic(node, true);
+  return node;
+};
+
+// Sistema de viga híbrido: cuerpo invisible para colisión + constraint visual + 2 constraints físicos
+export const createBeamSystem = (bodyA, bodyB) => {
+  const len = Math.hypot(bodyB.position.x - bodyA.position.x, bodyB.position.y - bodyA.position.y);
+
+  // Calcular posición y ángulo de la viga
+  const centerX = (bodyA.position.x + bodyB.position.x) / 2;
+  const centerY = (bodyA.position.y + bodyB.position.y) / 2;
+  const angle = Math.atan2(bodyB.position.y - bodyA.position.y, bodyB.position.x - bodyA.position.x);
+
+  // CREAR CUERPO FÍSICO INVISIBLE PARA COLISIÓN (pero más estable)
+  const beamBody = Bodies.rectangle(
+    centerX,
+    centerY,
+    len,
+    6, // Grosor para colisión
+    {
+      angle: angle,
+      isStatic: false,
+      density: 0.001, // Muy liviano para que no afecte mucho la física
+      friction: 0.8,
+      restitution: 0.01,
+      frictionAir: 0.01,
+      render: {
+        visible: false // INVISIBLE - no se dibuja
+      },
+      collisionFilter: {
+        category: 0x0002,
+        mask: 0x0001 // Solo colisiona con vehículos
+      }
+    }
+  );
+
+  // CONSTRAINT VISUAL entre nodos (lo que se ve)
+  const visualConstraint = Constraint.create({
+    bodyA: bodyA,
+    bodyB: bodyB,
+    length: len,
+    stiffness: 0.9,
+    damping: 0.1,
+    render: {
+      visible: true,
+      lineWidth: 4,
+      strokeStyle: "#374151",
+      type: "line"
+    }
+  });
+
+  // CONSTRAINTS FÍSICOS para conectar el cuerpo invisible a los nodos
+  const physicsConstraint1 = Constraint.create({
+    bodyA: bodyA,
+    bodyB: beamBody,
+    pointB: { x: -len/2, y: 0 },
+    stiffness: 0.9,
+    damping: 0.1,
+    length: 0,
+    render: { visible: false }
+  });
+
+  const physicsConstraint2 = Constraint.create({
+    bodyA: bodyB,
+    bodyB: beamBody,
+    pointB: { x: len/2, y: 0 },
+    stiffness: 0.9,
+    damping: 0.1,
+    length: 0,
+    render: { visible: false }
+  });
+
+  return {
+    beamBody: beamBody, // Para colisión física
+    visualConstraint: visualConstraint, // Para visualización
+    physicsConstraint1: physicsConstraint1,
+    physicsConstraint2: physicsConstraint2,
+    constraint: visualConstraint, // Para compatibilidad con código de estrés
+    length: len,
+    bodyA: bodyA,
+    bodyB: bodyB,
+    render: visualConstraint.render
+  };
+};
+
+// Componentes del sistema de viga que viven en el mundo de Matter
+export const beamSystemParts = (beamSystem) => [
+  beamSystem.beamBody,
+  beamSystem.visualConstraint,
+  beamSystem.physicsConstraint1,
+  beamSystem.physicsConstraint2
+];
+
+// Chasis, ruedas, ejes y estabilizadores de un vehículo
+export const createVehicleParts = (config, startX, startY) => {
+  const chassis = Bodies.rectangle(
+    startX,
+    startY,
+    config.chassis.width,
+    config.chassis.height,
+    {
+      density: config.chassis.density,
+      friction: config.physics.friction,
+      frictionAir: 0.01,
+      restitution: config.physics.restitution,
+      render: {
+        fillStyle: config.color.chassis,
+        strokeStyle: config.color.chassis.replace('4', '8'),
+        lineWidth: 2
+      },
+      collisionFilter: {
+        category: 0x0001,
+        mask: 0x0002 | 0x0008 | 0x0004
+      }
+    }
+  );
+
+  const wheelOffsetX = config.chassis.width * 0.35;
+
+  const createWheel = (x) => Bodies.circle(
+    x,
+    startY + config.wheels.offsetY,
+    config.wheels.radius,
+    {
+      density: config.wheels.density,
+      friction: config.physics.wheelFriction,
+      frictionAir: 0.005,
+      restitution: config.physics.restitution,
+      render: {
+        fillStyle: config.color.wheels,
+        strokeStyle: config.color.wheels.replace('4', '8'),
+        lineWidth: 2
+      },
+      collisionFilter: {
+        category: 0x0001,
+        mask: 0x0002 | 0x0008 | 0x0004
+      }
+    }
+  );
+
+  const wheelA = createWheel(startX - wheelOffsetX);
+  const wheelB = createWheel(startX + wheelOffsetX);
+
+  const axleA = Constraint.create({
+    bodyA: chassis,
+    pointA: { x: -wheelOffsetX, y: config.chassis.height / 2 },
+    bodyB: wheelA,
+    stiffness: config.physics.stiffness,
+    damping: config.physics.damping,
+    length: config.wheels.offsetY - config.chassis.height / 2,
+    render: { visible: false }
+  });
+
+  const axleB = Constraint.create({
+    bodyA: chassis,
+    pointA: { x: wheelOffsetX, y: config.chassis.height / 2 },
+    bodyB: wheelB,
+    stiffness: config.physics.stiffness,
+    damping: config.physics.damping,
+    length: config.wheels.offsetY - config.chassis.height / 2,
+    render: { visible: false }
+  });
+
+  const stabilizerA = Constraint.create({
+    bodyA: chassis,
+    pointA: { x: -wheelOffsetX * 0.5, y: -config.chassis.height / 3 },
+    bodyB: wheelA,
+    stiffness: config.physics.stiffness * 0.5,
+    damping: config.physics.damping * 1.5,
+    length: config.wheels.offsetY * 0.8,
+    render: { visible: false }
+  });
+
+  const stabilizerB = Constraint.create({
+    bodyA: chassis,
+    pointA: { x: wheelOffsetX * 0.5, y: -config.chassis.height / 3 },
+    bodyB: wheelB,
+    stiffness: config.physics.stiffness * 0.5,
+    damping: config.physics.damping * 1.5,
+    length: config.wheels.offsetY * 0.8,
+    render: { visible: false }
+  });
+
+  return {
+    chassis, wheelA, wheelB,
+    axleA, axleB,
+    stabilizerA, stabilizerB
+  };
+};
+
+// Cuerpos móviles del vehículo, en el orden de los buffers de transformación
+export const VEHICLE_BODY_KEYS = ['chassis', 'wheelA', 'wheelB'];
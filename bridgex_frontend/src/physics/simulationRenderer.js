@@ -0,0 +1,122 @@
+// Render de la simulación en el hilo principal: terreno, nodos y vigas se dibujan en una capa
+// cacheada que solo se regenera cuando cambia algo visible; cada frame copia la capa y dibuja
+// los cuerpos móviles, así el costo por frame no depende del número de vigas.
+import Matter from 'matter-js';
+
+const { Composite } = Matter;
+
+// Intervalo mínimo entre regeneraciones de la capa estática (ms)
+const LAYER_REDRAW_INTERVAL = 100;
+
+// Peso de la muestra más reciente en el tiempo de dibujo reportado
+const TIMING_ALPHA = 0.1;
+
+const drawBody = (ctx, body) => {
+  const parts = body.parts.length > 1 ? body.parts.slice(1) : body.parts;
+
+  parts.forEach((part) => {
+    const style = part.render;
+    if (!style.visible) return;
+
+    ctx.globalAlpha = style.opacity ?? 1;
+    ctx.beginPath();
+    if (part.circleRadius) {
+      ctx.arc(part.position.x, part.position.y, part.circleRadius, 0, 2 * Math.PI);
+    } else {
+      const vertices = part.vertices;
+      ctx.moveTo(vertices[0].x, vertices[0].y);
+      for (let j = 1; j < vertices.length; j++) {
+        ctx.lineTo(vertices[j].x, vertices[j].y);
+      }
+      ctx.closePath();
+    }
+
+    ctx.fillStyle = style.fillStyle;
+    ctx.fill();
+    if (style.lineWidth) {
+      ctx.lineWidth = style.lineWidth;
+      ctx.strokeStyle = style.strokeStyle;
+      ctx.stroke();
+    }
+  });
+
+  ctx.globalAlpha = 1;
+};
+
+const drawConstraint = (ctx, constraint) => {
+  const style = constraint.render;
+  if (!style.visible || !constraint.pointA || !constraint.pointB) return;
+
+  const { bodyA, bodyB, pointA, pointB } = constraint;
+  ctx.beginPath();
+  ctx.moveTo((bodyA ? bodyA.position.x : 0) + pointA.x, (bodyA ? bodyA.position.y : 0) + pointA.y);
+  ctx.lineTo((bodyB ? bodyB.position.x : 0) + pointB.x, (bodyB ? bodyB.position.y : 0) + pointB.y);
+  ctx.lineWidth = style.lineWidth;
+  ctx.strokeStyle = style.strokeStyle;
+  ctx.stroke();
+};
+
+export const createSimulationRenderer = (render, world, dynamicBodies) => {
+  const { canvas, context } = render;
+  const pixelRatio = render.options.pixelRatio || 1;
+  const dynamic = new Set(dynamicBodies);
+
+  const layer = document.createElement('canvas');
+  layer.width = canvas.width;
+  layer.height = canvas.height;
+  const layerContext = layer.getContext('2d');
+
+  let dirty = true;
+  let lastLayerDraw = -Infinity;
+  let frameId = null;
+  let drawTime = 0;
+
+  const drawLayer = () => {
+    layerContext.setTransform(1, 0, 0, 1, 0, 0);
+    layerContext.clearRect(0, 0, layer.width, layer.height);
+    layerContext.setTransform(pixelRatio, 0, 0, pixelRatio, 0, 0);
+
+    // Mismo orden que Matter.Render: cuerpos y luego constraints
+    Composite.allBodies(world).forEach((body) => {
+      if (!dynamic.has(body)) drawBody(layerContext, body);
+    });
+    Composite.allConstraints(world).forEach((constraint) => drawConstraint(layerContext, constraint));
+  };
+
+  const frame = (time) => {
+    const start = performance.now();
+
+    if (dirty && time - lastLayerDraw >= LAYER_REDRAW_INTERVAL) {
+      drawLayer();
+      dirty = false;
+      lastLayerDraw = time;
+    }
+
+    // El fondo es el CSS del canvas (igual que Matter.Render)
+    context.setTransform(1, 0, 0, 1, 0, 0);
+    context.clearRect(0, 0, canvas.width, canvas.height);
+    context.drawImage(layer, 0, 0);
+
+    context.setTransform(pixelRatio, 0, 0, pixelRatio, 0, 0);
+    dynamic.forEach((body) => drawBody(context, body));
+
+    const elapsed = performance.now() - start;
+    drawTime = drawTime ? (1 - TIMING_ALPHA) * drawTime + TIMING_ALPHA * elapsed : elapsed;
+    frameId = requestAnimationFrame(frame);
+  };
+
+  return {
+    start: () => {
+      if (frameId === null) frameId = requestAnimationFrame(frame);
+    },
+    stop: () => {
+      if (frameId !== null) cancelAnimationFrame(frameId);
+      frameId = null;
+    },
+    // Marcar la capa estática para regenerarla (colores de estrés, vigas rotas)
+    invalidate: () => {
+      dirty = true;
+    },
+    getDrawTime: () => drawTime
+  };
+};
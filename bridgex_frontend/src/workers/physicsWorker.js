@@ -0,0 +1,336 @@
+// Worker de física: durante la simulación el paso de Matter, la conducción del vehículo,
+// el estrés de las vigas y su rotura se ejecutan aquí. Al hilo principal solo llegan la
+// transformación del vehículo y los cambios visibles de las vigas.
+import Matter from 'matter-js';
+import {
+  configureEngine,
+  createTerrainBodies,
+  createNodeBody,
+  createBeamSystem,
+  beamSystemParts,
+  createVehicleParts,
+  VEHICLE_BODY_KEYS
+} from '../physics/sceneBodies.js';
+
+const { Engine, World, Body } = Matter;
+
+// Paso fijo del motor (el mismo que usa el Runner del hilo principal)
+const STEP_MS = 16.666;
+
+// Pasos máximos por tick: si el worker se retrasa no intenta recuperar todo el tiempo perdido
+const MAX_STEPS_PER_TICK = 4;
+
+// Umbrales de color (mismos que la visualización de estrés original)
+const STRESS_BUCKETS = [0.1, 0.3, 0.5, 0.7, 0.9];
+
+// Cambio mínimo de grosor (px) para reenviar una viga al render
+const WIDTH_EPSILON = 0.5;
+
+// Peso de la muestra más reciente en el tiempo de paso reportado
+const TIMING_ALPHA = 0.1;
+
+let sim = null;
+
+const stressBucket = (stress) => {
+  let bucket = 0;
+  while (bucket < STRESS_BUCKETS.length && stress > STRESS_BUCKETS[bucket]) bucket++;
+  return bucket;
+};
+
+// Construir el mundo a partir de la geometría enviada por el hilo principal
+const startSimulation = (msg) => {
+  stopSimulation();
+
+  const engine = Engine.create();
+  configureEngine(engine, msg.gravity);
+  World.add(engine.world, createTerrainBodies(msg.canvasSize));
+
+  // nodes: [x, y, isSupport, isLoad] por nodo
+  const nodeCount = msg.nodes.length / 4;
+  const nodes = new Array(nodeCount);
+  for (let i = 0; i < nodeCount; i++) {
+    const k = i * 4;
+    nodes[i] = createNodeBody(msg.nodes[k], msg.nodes[k + 1], msg.nodes[k + 2] === 1, msg.nodes[k + 3] === 1);
+  }
+  World.add(engine.world, nodes);
+
+  const beamCount = msg.beamStart.length;
+  const beams = new Array(beamCount).fill(null);
+  const alive = new Uint8Array(beamCount);
+  for (let i = 0; i < beamCount; i++) {
+    const bodyA = nodes[msg.beamStart[i]];
+    const bodyB = nodes[msg.beamEnd[i]];
+    // Vigas que referencian nodos inexistentes no participan en la simulación
+    if (!bodyA || !bodyB) continue;
+
+    beams[i] = createBeamSystem(bodyA, bodyB);
+    alive[i] = 1;
+    World.add(engine.world, beamSystemParts(beams[i]));
+  }
+
+  const vehicle = createVehicleParts(msg.vehicle.config, msg.vehicle.startX, msg.vehicle.startY);
+  World.add(engine.world, Object.values(vehicle));
+
+  sim = {
+    version: msg.version,
+    engine,
+    beams,
+    alive,
+    beamCount,
+    stresses: new Float32Array(beamCount),
+    lastBucket: new Int8Array(beamCount).fill(-1),
+    lastWidth: new Float32Array(beamCount),
+    broken: [],
+    vehicle,
+    config: msg.vehicle.config,
+    canvasSize: msg.canvasSize,
+    options: msg.options,
+    steps: 0,
+    status: 'testing',
+    progress: 0,
+    acceleration: 0,
+    awaitingAck: false,
+    stepTime: 0,
+    lastTick: performance.now(),
+    accumulator: 0,
+    timer: setInterval(tick, STEP_MS)
+  };
+};
+
+// Conducción con aceleración gradual (misma lógica que tenía el intervalo del hilo principal)
+const driveVehicle = () => {
+  const { chassis, wheelA, wheelB } = sim.vehicle;
+  const config = sim.config;
+  const { height } = sim.canvasSize;
+
+  // ACELERACIÓN GRADUAL - Los primeros 2 segundos (tiempo simulado)
+  const elapsedTime = sim.steps * STEP_MS / 1000;
+  const accelerationPhase = Math.min(elapsedTime / 2, 1);
+
+  // Factor de aceleración suave (curva easing)
+  const accelerationCurve = 0.5 * (1 - Math.cos(accelerationPhase * Math.PI));
+
+  const currentTorque = config.torque * accelerationCurve;
+  const currentSpeed = config.speed * accelerationCurve * 1000;
+  const maxAngularVelocity = 0.2 * accelerationCurve;
+
+  Body.setAngularVelocity(wheelA, Math.min(wheelA.angularVelocity + currentTorque, maxAngularVelocity));
+  Body.setAngularVelocity(wheelB, Math.min(wheelB.angularVelocity + currentTorque, maxAngularVelocity));
+
+  // Fuerza horizontal gradual
+  if (chassis.position.y > height - (height * 0.4)) {
+    Body.applyForce(chassis, chassis.position, { x: currentSpeed, y: 0 });
+  }
+
+  // Control de estabilidad más suave
+  if (Math.abs(chassis.angle) > 0.3) {
+    const correctionTorque = -chassis.angle * 0.005 * accelerationCurve;
+    Body.setAngularVelocity(chassis, chassis.angularVelocity + correctionTorque);
+  }
+
+  // Límite de velocidad gradual
+  const maxVelocity = 6 * accelerationCurve;
+  [chassis, wheelA, wheelB].forEach((body) => {
+    if (body.velocity.x > maxVelocity) {
+      Body.setVelocity(body, { x: maxVelocity, y: body.velocity.y });
+    }
+  });
+
+  sim.acceleration = accelerationCurve * 100;
+};
+
+const updateProgress = () => {
+  const { chassis } = sim.vehicle;
+  const { width, height } = sim.canvasSize;
+
+  sim.progress = Math.min((chassis.position.x - width * 0.125) / (width * 0.75) * 100, 100);
+
+  // El primer resultado se conserva hasta que el hilo principal detenga la simulación
+  if (sim.status !== 'testing') return;
+  if (sim.progress >= 95) {
+    sim.status = 'success';
+  } else if (chassis.position.y > height - (height * 0.15)) {
+    sim.status = 'failed';
+  }
+};
+
+// Estrés por deformación + movimiento del cuerpo físico de cada viga; las que superan el umbral se rompen
+const updateStresses = () => {
+  const { beams, alive, stresses, options } = sim;
+  const toBreak = [];
+
+  for (let i = 0; i < sim.beamCount; i++) {
+    if (!alive[i]) continue;
+
+    const { bodyA, bodyB, beamBody, length } = beams[i];
+    const currentLength = Math.hypot(bodyB.position.x - bodyA.position.x, bodyB.position.y - bodyA.position.y);
+
+    const deformationStress = Math.abs(currentLength - length) / length;
+    const physicsStress = Math.hypot(beamBody.velocity.x, beamBody.velocity.y) * 0.01 +
+      Math.abs(beamBody.angularVelocity) * 0.1;
+    const totalStress = deformationStress + physicsStress;
+    stresses[i] = totalStress;
+
+    if (options.autoBreak && totalStress > options.threshold * (1 + Math.random() * 0.2)) {
+      toBreak.push(i);
+    }
+  }
+
+  toBreak.forEach((i) => {
+    alive[i] = 0;
+    stresses[i] = 0;
+    World.remove(sim.engine.world, beamSystemParts(beams[i]));
+    sim.broken.push(i);
+  });
+};
+
+const step = () => {
+  sim.steps += 1;
+  driveVehicle();
+  Engine.update(sim.engine, STEP_MS);
+  updateProgress();
+  updateStresses();
+};
+
+// Transformación (x, y, ángulo) de los cuerpos del vehículo; con velocidades al detener
+const packVehicle = (withVelocity) => {
+  const stride = withVelocity ? 6 : 3;
+  const packed = new Float32Array(VEHICLE_BODY_KEYS.length * stride);
+
+  VEHICLE_BODY_KEYS.forEach((key, j) => {
+    const body = sim.vehicle[key];
+    const k = j * stride;
+    packed[k] = body.position.x;
+    packed[k + 1] = body.position.y;
+    packed[k + 2] = body.angle;
+    if (withVelocity) {
+      packed[k + 3] = body.velocity.x;
+      packed[k + 4] = body.velocity.y;
+      packed[k + 5] = body.angularVelocity;
+    }
+  });
+
+  return packed;
+};
+
+// Enviar solo las vigas cuyo color o grosor visible cambió desde el último frame enviado
+const postFrame = () => {
+  const { alive, stresses, lastBucket, lastWidth } = sim;
+  const changed = [];
+  let stressSum = 0;
+  let aliveCount = 0;
+
+  for (let i = 0; i < sim.beamCount; i++) {
+    if (!alive[i]) continue;
+
+    const stress = stresses[i];
+    stressSum += stress;
+    aliveCount++;
+
+    const bucket = stressBucket(stress);
+    const width = Math.max(4, 4 + stress * 4);
+    if (bucket !== lastBucket[i] || Math.abs(width - lastWidth[i]) >= WIDTH_EPSILON) {
+      lastBucket[i] = bucket;
+      lastWidth[i] = width;
+      changed.push(i);
+    }
+  }
+
+  const deltaIndices = new Uint32Array(changed);
+  const deltaBuckets = new Uint8Array(changed.length);
+  const deltaWidths = new Float32Array(changed.length);
+  changed.forEach((beamIdx, j) => {
+    deltaBuckets[j] = lastBucket[beamIdx];
+    deltaWidths[j] = lastWidth[beamIdx];
+  });
+
+  const vehicle = packVehicle(false);
+  const broken = new Uint32Array(sim.broken);
+  sim.broken = [];
+  sim.awaitingAck = true;
+
+  self.postMessage({
+    type: 'frame',
+    version: sim.version,
+    vehicle,
+    progress: sim.progress,
+    acceleration: sim.acceleration,
+    status: sim.status,
+    broken,
+    deltaIndices,
+    deltaBuckets,
+    deltaWidths,
+    averageStress: aliveCount ? stressSum / aliveCount : 0,
+    stepTime: sim.stepTime
+  }, [vehicle.buffer, broken.buffer, deltaIndices.buffer, deltaBuckets.buffer, deltaWidths.buffer]);
+};
+
+// Paso fijo con acumulador; si el hilo principal no confirmó el frame anterior se sigue
+// simulando pero no se envía otro (los cambios se acumulan para el siguiente)
+function tick() {
+  const now = performance.now();
+  sim.accumulator = Math.min(sim.accumulator + now - sim.lastTick, STEP_MS * MAX_STEPS_PER_TICK);
+  sim.lastTick = now;
+
+  let steps = 0;
+  while (sim.accumulator >= STEP_MS) {
+    step();
+    sim.accumulator -= STEP_MS;
+    steps++;
+  }
+
+  if (steps > 0) {
+    const perStep = (performance.now() - now) / steps;
+    sim.stepTime = sim.stepTime ? (1 - TIMING_ALPHA) * sim.stepTime + TIMING_ALPHA * perStep : perStep;
+    if (!sim.awaitingAck) postFrame();
+  }
+}
+
+// Detener y devolver el estado final para que el hilo principal continúe desde ahí
+const stopSimulation = () => {
+  if (!sim) return;
+  clearInterval(sim.timer);
+
+  // Estrés final solo de las vigas que siguen en pie, en el orden del hilo principal
+  const finalStresses = new Float32Array(sim.alive.reduce((count, isAlive) => count + isAlive, 0));
+  let k = 0;
+  for (let i = 0; i < sim.beamCount; i++) {
+    if (sim.alive[i]) finalStresses[k++] = sim.stresses[i];
+  }
+
+  const vehicle = packVehicle(true);
+  const broken = new Uint32Array(sim.broken);
+  self.postMessage(
+    { type: 'stopped', version: sim.version, vehicle, broken, stresses: finalStresses },
+    [vehicle.buffer, broken.buffer, finalStresses.buffer]
+  );
+  sim = null;
+};
+
+self.onmessage = (event) => {
+  const msg = event.data;
+
+  switch (msg.type) {
+    case 'start':
+      startSimulation(msg);
+      break;
+    case 'options':
+      if (!sim) break;
+      sim.options = { ...sim.options, ...msg.options };
+      if (msg.options.gravity !== undefined) {
+        sim.engine.gravity.y = msg.options.gravity;
+      }
+      break;
+    case 'resetVisual':
+      if (!sim) break;
+      sim.lastBucket.fill(-1);
+      sim.lastWidth.fill(0);
+      break;
+    case 'ack':
+      if (sim && msg.version === sim.version) sim.awaitingAck = false;
+      break;
+    case 'stop':
+      stopSimulation();
+      break;
+  }
+};